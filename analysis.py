@@ -1,83 +1,91 @@
+import argparse
+import time
 from owlracle import OwlracleConnection
-import pandas as pd
-import matplotlib.pyplot as plt
-import numpy as np
+from etherscan import EtherscanConnection
+from candle_cache import CandleCache
+from backfill import BackfillJob
+from sources import SOURCES
+from etl import build_pipeline
+from intraday import build_intraday, read_intraday
+from panel import fetch_networks, build_panel, write_panel
+from rolling_stats import update_rolling, last_update
+
+parser = argparse.ArgumentParser(description='Builds data/data_complete.csv from the Owlracle and Etherscan sources')
+parser.add_argument('--full', action='store_true', help='rebuild the whole dataset instead of appending new days')
+parser.add_argument('--intraday', type=int, metavar='MINUTES', help='also write the gas price candles of this timeframe to data/intraday/, one file per month')
+args = parser.parse_args()
 
 # Create an instance of the OwlracleConnection class
 eth_gas = OwlracleConnection()
 
-# Get the average gas price for the provided time period in Unix timestamps
-#data_owlracle = eth_gas.get_average_gas_price('eth', 1577833200, 1672354800, candles=1094) 
-
-# Save the data to a csv file
-#data_owlracle.to_csv('data/data_owlracle.csv', index=False)
-
-# In case the API is not responding load the data locally
-gas_data = pd.read_csv('data/data_owlracle.csv')
-
-# Calculate the average gas price as a new colunm from the 4 columns that contain the gas price
-gas_data['average_gas_price'] = gas_data[['GasPriceOpen', 'GasPriceClose', 'GasPriceLow', 'GasPriceHigh']].mean(axis=1)
-
-# Load the trading volume data - USD - https://www.kaggle.com/datasets/kapturovalexander/bitcoin-and-ethereum-prices-from-start-to-2023?select=Ethereum+prices.csv
-trading_volume = pd.read_csv('data/pricesdata.csv', sep=',')
-trading_volume.rename(columns={'Open': 'EthPriceOpenUSD', 'High': 'EthPriceHighUSD', 'Low': 'EthPriceLowUSD', 'Close': 'EthPriceCloseUSD', 'Adj Close': 'EthPriceAdjustedCloseUSD', 'Volume': 'EthVolume'}, inplace=True)
-
-# Load etherscan data - https://etherscan.io/charts
-# Load average transaction data
-tx_growth = pd.read_csv('data/export-TxGrowth.csv', sep=',')
-tx_growth.drop(columns=['UnixTimeStamp'], inplace=True)
-tx_growth.rename(columns={'Value': 'TransactionsAmount'}, inplace=True)
-
-# Load Daily Eth Burnt
-eth_burnt = pd.read_csv('data/export-DailyEthBurnt.csv', sep=',')
-eth_burnt.rename(columns={'BurntFees': 'DailyEthBurnt'}, inplace=True)
-
-# Load Block Size
-block_size = pd.read_csv('data/export-BlockSize.csv', sep=',')
-block_size.drop(columns=['UnixTimeStamp'], inplace=True)
-block_size.rename(columns={'Value': 'BlockSize'}, inplace=True)
-
-# Load DailyActiveAddress
-daily_active_address = pd.read_csv('data/export-DailyActiveEthAddress.csv', sep=',')
-daily_active_address.rename(columns={'Unique Address Total Count': 'UniqueAddressTotalCount', 'Unique Address Receive Count': 'UniqueAddressReceiveCount', 'Unique Address Sent Count': 'UniqueAddressSentCount'}, inplace=True)
-
-# Convert the timestamp to a datetime object
-gas_data['Timestamp'] = pd.to_datetime(gas_data['Timestamp']).dt.date
-trading_volume['Date'] = pd.to_datetime(trading_volume['Date']).dt.date
-tx_growth['Date(UTC)'] = pd.to_datetime(tx_growth['Date(UTC)']).dt.date
-eth_burnt['Date(UTC)'] = pd.to_datetime(eth_burnt['Date(UTC)']).dt.date
-block_size['Date(UTC)'] = pd.to_datetime(block_size['Date(UTC)']).dt.date
-daily_active_address['Date(UTC)'] = pd.to_datetime(daily_active_address['Date(UTC)']).dt.date
-
-# Rename the date columns to match
-gas_data = gas_data.rename(columns={'Timestamp': 'Date'})
-trading_volume = trading_volume.rename(columns={'Date': 'Date'})
-tx_growth = tx_growth.rename(columns={'Date(UTC)': 'Date'})
-eth_burnt = eth_burnt.rename(columns={'Date(UTC)': 'Date'})
-block_size = block_size.rename(columns={'Date(UTC)': 'Date'})
-daily_active_address = daily_active_address.rename(columns={'Date(UTC)': 'Date'})
-
-# Merge the data on date
-print(f'Number of rows in gas_data: {gas_data.shape[0]}')
-
-merged_df = gas_data.merge(trading_volume, on='Date', how='inner')
-print(f'Number of rows after merging gas_data and trading_volume: {merged_df.shape[0]}')
-
-merged_df = merged_df.merge(tx_growth, on='Date', how='inner')
-print(f'Number of rows after merging with tx_growth: {merged_df.shape[0]}')
-
-merged_df = merged_df.merge(block_size, on='Date', how='inner')
-print(f'Number of rows after merging with block_size: {merged_df.shape[0]}')
-
-merged_df = merged_df.merge(eth_burnt, on='Date', how='left')
-print(f'Number of rows after merging with eth_burnt: {merged_df.shape[0]}')
-
-merged_df = merged_df.merge(daily_active_address, on='Date', how='inner')
-print(f'Number of rows after merging with daily_active_address: {merged_df.shape[0]}')
-
-
-# Save data to csv
-merged_df.to_csv('data/data_complete.csv', index=False)
-
-
-
+# Keep the candles on disk so only the days missing since the last run are fetched
+# Closed candles never change, so the whole history is kept and never fetched twice
+gas_cache = CandleCache(eth_gas, 'data/candles.sqlite')
+
+# The history starts on 2019-12-31 and ends with the last closed day, on a daily slot boundary,
+# so every run asks the cache for the days that closed since the previous one
+from_time = 1577833200
+to_time = int(time.time()) // 86400 * 86400 - 1
+
+# Get the average gas price of every network in sources.NETWORKS for the provided time period
+# in Unix timestamps, the networks are fetched in parallel and saved to their csv files
+fetched = fetch_networks(gas_cache, from_time, to_time)
+print(f"Fetched gas prices of: {', '.join(fetched) or 'none'}")
+
+if args.intraday:
+    # Fill the cache with the minute candles first: rate limited, retried and resumed after an interruption
+    checkpoint = BackfillJob(gas_cache, 'eth', from_time, to_time, timeframe=args.intraday).run()
+    if checkpoint is not None and checkpoint['failed']:
+        print(f"Intraday backfill: {len(checkpoint['failed'])} windows failed, they are retried on the next run")
+
+    # Processed one month at a time so multi-year minute candles fit in memory
+    months = build_intraday(gas_cache, 'eth', from_time, to_time, timeframe=args.intraday, full=args.full)
+    if months is None:
+        print('Error: could not fetch the intraday candles')
+    else:
+        print(f'Intraday {args.intraday}m candles: wrote {len(months)} monthly partitions')
+
+        # Only the candles newer than the last run are fed to the rolling statistics
+        start = None if args.full else last_update('eth', args.intraday)
+        intraday = read_intraday('eth', args.intraday, start=start, columns=['average_gas_price'])
+        if intraday is not None:
+            rows = update_rolling(intraday['average_gas_price'], 'eth', args.intraday, window=24 * 60 // args.intraday, full=args.full)
+            print(f'Intraday rolling statistics: {len(rows)} new candles')
+
+# Refresh the Etherscan chart exports, every series is fetched concurrently in one round of requests
+# The files of the series that could not be fetched are kept as they are and the API's reason
+# is printed per series, the daily statistics endpoints need an Etherscan API PRO key
+refreshed = EtherscanConnection().refresh_exports()
+print(f"Refreshed Etherscan charts: {', '.join(refreshed) or 'none'}")
+
+# The sources, their date formats and join kinds are listed in sources.py
+# In case the API is not responding the gas data is loaded from data/data_owlracle.csv
+# Only the days newer than the last build are merged and appended, unless a source's
+# history changed or --full is passed
+# Every source is loaded and normalized in its own branch, concurrently, and only the
+# branches of the source files that changed since the last run are run again
+outputs, stage_report = build_pipeline(SOURCES, 'data/data_complete.csv', 'data/manifest.json', full=args.full).run()
+merged_df, dropped_rows, rebuild_reason = outputs['write']
+
+cached = [name for name, _, how in stage_report if how == 'cached']
+print(f'Pipeline: ran {len(stage_report) - len(cached)} stages, loaded {len(cached)} from the cache')
+
+if rebuild_reason is None:
+    print(f'Incremental build: appended {merged_df.shape[0]} new rows')
+else:
+    print(f'Full rebuild ({rebuild_reason}): wrote {merged_df.shape[0]} rows')
+
+# Report how many rows of each source did not make it into the merged data
+for name, count in dropped_rows.items():
+    print(f'Rows dropped from {name}: {count}')
+
+# Stack the gas prices of every network with a file into one (network, date) panel
+panel = build_panel()
+if panel is not None:
+    write_panel(panel)
+    print(f"Gas price panel: {panel.shape[0]} rows for {', '.join(panel.index.get_level_values('network').unique())}")
+
+    # Rolling gas price statistics of every network, only the new days are processed
+    for network in panel.index.get_level_values('network').unique():
+        rows = update_rolling(panel.xs(network, level='network')['average_gas_price'], network, full=args.full)
+        print(f'Rolling statistics of {network}: {len(rows)} new days')
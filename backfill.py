@@ -0,0 +1,195 @@
+import argparse
+import json
+import os
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import requests
+from owlracle import OwlracleConnection, MAX_CANDLES_PER_REQUEST
+from candle_cache import CandleCache
+from ratelimit import TokenBucket
+
+# Where every backfill job keeps its checkpoint
+BACKFILL_DIRECTORY = 'data/backfill'
+
+# Owlracle history requests per second allowed by the API key, set it to your key's quota
+RATE_LIMIT = 1
+
+# HTTP statuses that are retried: too many requests and server errors
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+def checkpoint_path(network, timeframe, from_time, to_time, directory=BACKFILL_DIRECTORY):
+    """Returns the checkpoint file of the job backfilling a network's candles over a time range"""
+    return os.path.join(directory, f'{network}_{timeframe}m_{from_time}_{to_time}.json')
+
+
+class BackfillJob:
+    """Fetches a long candle history into a CandleCache, resuming where an earlier run stopped
+
+    The time range is split into windows of at most `candles` candles. Workers fetch the
+    windows concurrently, each request waiting for a token of the shared rate limiter, and
+    retry 429 and 5xx responses with jittered exponential backoff. Every window is stored in
+    the cache in one transaction as soon as it arrives. The stored slots are the durable
+    checkpoint: an interrupted job only fetches the windows the cache does not hold yet. The
+    job's JSON file records the completed and failed windows and the request counts."""
+
+    def __init__(self, cache, network, from_time, to_time, timeframe=1440, candles=MAX_CANDLES_PER_REQUEST,
+                 limiter=None, max_workers=4, max_retries=6, base_delay=1.0, max_delay=60.0, directory=BACKFILL_DIRECTORY):
+        """cache: CandleCache the candles are stored in, its connection fetches them. It should
+        keep the whole time range (no max_age or max_rows below it), otherwise the evicted
+        windows are fetched again by the next run
+        network: 'eth' or 'bsc'
+        from_time: unix timestamp
+        to_time: unix timestamp
+        timeframe: timeframe of the candles in minutes
+        candles: maximum number of candles per request
+        limiter: TokenBucket shared by every request, defaults to RATE_LIMIT requests per second
+        max_workers: number of concurrent requests
+        max_retries: retries of a window before it is left for the next run
+        base_delay: seconds of the first backoff, doubled on every retry
+        max_delay: longest backoff in seconds"""
+        self.cache = cache
+        self.network = network
+        self.from_time = from_time
+        self.to_time = to_time
+        self.timeframe = timeframe
+        self.candles = candles
+        self.limiter = limiter or TokenBucket(RATE_LIMIT)
+        self.max_workers = max_workers
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.path = checkpoint_path(network, timeframe, from_time, to_time, directory)
+        self.checkpoint = self._load_checkpoint()
+
+    def _load_checkpoint(self):
+        if os.path.exists(self.path):
+            with open(self.path, 'r') as f:
+                return json.load(f)
+        return {'network': self.network, 'timeframe': self.timeframe, 'from_time': self.from_time,
+                'to_time': self.to_time, 'completed': [], 'failed': [], 'requests': 0, 'retries': 0}
+
+    def _save_checkpoint(self):
+        """Writes the checkpoint next to the old one and moves it over it, so a crash never leaves half a file"""
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        temporary_path = self.path + '.tmp'
+        with open(temporary_path, 'w') as f:
+            json.dump(self.checkpoint, f)
+        os.replace(temporary_path, self.path)
+
+    def windows(self):
+        """Returns the (from, to) windows of the job, aligned to the candles' buckets
+
+        Both ends are inclusive, so a window never asks for a candle of the next one."""
+        step = self.timeframe * 60
+        window = self.candles * step
+        start = self.from_time // step * step
+        windows = []
+        while start <= self.to_time:
+            end = min(start + window - 1, self.to_time)
+            windows.append((max(start, self.from_time), end))
+            start += window
+        return windows
+
+    def pending(self):
+        """Returns the windows with closed candles that are not stored in the cache yet
+
+        The cache holds every stored window durably, so it decides what is left to fetch. A window
+        evicted from the cache since it was checkpointed is fetched again."""
+        step = self.timeframe * 60
+        running = int(time.time()) // step * step
+        pending = []
+        for start, end in self.windows():
+            # The bucket that is still running is never stored, so it does not keep a window pending
+            end = min(end, running - 1)
+            if end >= start and self.cache.missing_intervals(self.network, start, end, self.timeframe):
+                pending.append((start, end))
+        return pending
+
+    def _backoff(self, attempt, retry_after=None):
+        """Returns the seconds to wait before a retry: full jitter over an exponentially growing delay"""
+        delay = min(self.max_delay, self.base_delay * 2 ** attempt)
+        if retry_after is not None:
+            # The server said when to come back, wait at least that long
+            return max(float(retry_after), random.uniform(0, delay))
+        return random.uniform(0, delay)
+
+    def _fetch_window(self, window):
+        """Fetches one window, retrying 429, 5xx and connection errors
+
+        Returns: (dataframe of the candles, number of retries)"""
+        for attempt in range(self.max_retries + 1):
+            self.limiter.acquire()
+            try:
+                data = self.cache.connection.fetch_candles(self.network, window[0], window[1], self.timeframe, self.candles)
+                return data, attempt
+            except requests.HTTPError as e:
+                status = e.response.status_code if e.response is not None else None
+                if status not in RETRY_STATUSES or attempt == self.max_retries:
+                    raise
+                retry_after = e.response.headers.get('Retry-After')
+                time.sleep(self._backoff(attempt, retry_after if retry_after and retry_after.isdigit() else None))
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt == self.max_retries:
+                    raise
+                time.sleep(self._backoff(attempt))
+
+    def run(self):
+        """Fetches every pending window and checkpoints each one as it is stored
+
+        Returns: checkpoint dict, 'failed' lists the windows left for the next run"""
+        if self.cache.connection.api_key is None:
+            print("Error: Owlracle API key not loaded")
+            return None
+
+        windows = self.pending()
+        self.checkpoint['failed'] = []
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {executor.submit(self._fetch_window, window): window for window in windows}
+
+            # Only this thread writes the cache and the checkpoint, in the order the windows finish
+            for future in as_completed(futures):
+                window = futures[future]
+                try:
+                    data, retries = future.result()
+                except (requests.RequestException, ValueError, KeyError) as e:
+                    print(f"Error: Backfill of {self.network} {window[0]}-{window[1]} failed ({e})")
+                    self.checkpoint['failed'].append(list(window))
+                    self._save_checkpoint()
+                    continue
+
+                self.cache.store(self.network, self.timeframe, data, window[0], window[1])
+                self.checkpoint['completed'].append(list(window))
+                self.checkpoint['requests'] += retries + 1
+                self.checkpoint['retries'] += retries
+                self._save_checkpoint()
+
+        return self.checkpoint
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Backfills the Owlracle gas price history into data/candles.sqlite')
+    parser.add_argument('network', help="'eth' or 'bsc'")
+    parser.add_argument('from_time', type=int, help='unix timestamp')
+    parser.add_argument('to_time', type=int, help='unix timestamp')
+    parser.add_argument('--timeframe', type=int, default=1440, help='timeframe of the candles in minutes')
+    parser.add_argument('--rate', type=float, default=RATE_LIMIT, help="requests per second allowed by the API key's quota")
+    parser.add_argument('--workers', type=int, default=4, help='concurrent requests')
+    args = parser.parse_args()
+
+    cache = CandleCache(OwlracleConnection(), 'data/candles.sqlite')
+    job = BackfillJob(cache, args.network, args.from_time, args.to_time, timeframe=args.timeframe,
+                      limiter=TokenBucket(args.rate), max_workers=args.workers)
+
+    checkpoint = job.run()
+    if checkpoint is not None:
+        print(f"Backfilled {len(job.windows()) - len(job.pending())}/{len(job.windows())} windows with "
+              f"{checkpoint['requests']} requests ({checkpoint['retries']} retries)")
+        if checkpoint['failed']:
+            print(f"{len(checkpoint['failed'])} windows failed, run the same command again to resume")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+"""Benchmark of OwlracleConnection.flatten_json_data against the previous per-candle dict loop
+
+Run from the repository root:
+
+    python benchmarks/bench_flatten.py
+"""
+import contextlib
+import os
+import sys
+import time
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from owlracle import OwlracleConnection
+from synthetic import synthetic_payload
+
+SIZES = [1_000, 100_000, 1_000_000]
+
+
+def legacy_flatten_json_data(json_data):
+    """The per-candle implementation flatten_json_data replaced, including its payload print"""
+    flat_data = []
+
+    print(json_data)
+
+    for candle in json_data['candles']:
+        flat_candle = {
+            'Timestamp': candle['timestamp'],
+            'GasPriceOpen': candle['gasPrice']['open'],
+            'GasPriceClose': candle['gasPrice']['close'],
+            'GasPriceLow': candle['gasPrice']['low'],
+            'GasPriceHigh': candle['gasPrice']['high'],
+            'avgGas': candle['avgGas'],
+            'Samples': candle['samples']
+        }
+        flat_data.append(flat_candle)
+
+    df = pd.DataFrame(flat_data)
+
+    # The old path left the timestamps as strings, parse them like analysis.py did
+    df['Timestamp'] = pd.to_datetime(df['Timestamp'])
+
+    return df
+
+
+def measure(function, payload):
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        start = time.perf_counter()
+        function(payload)
+        return time.perf_counter() - start
+
+
+def main():
+    connection = OwlracleConnection.__new__(OwlracleConnection)
+
+    print(f"{'candles':>10} {'legacy rows/s':>15} {'columnar rows/s':>17} {'speedup':>8}")
+    for count in SIZES:
+        payload = synthetic_payload(count)
+        legacy = measure(legacy_flatten_json_data, payload)
+        columnar = measure(connection.flatten_json_data, payload)
+        print(f"{count:>10} {count / legacy:>15,.0f} {count / columnar:>17,.0f} {legacy / columnar:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
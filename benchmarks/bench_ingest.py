@@ -0,0 +1,94 @@
+"""Benchmark of the typed CSV ingestion in etl.load_source against the previous loading path
+
+Every registered source is scaled to 100 times its size by repeating its rows with
+shifted dates, written to a temporary directory and loaded both ways.
+
+Run from the repository root:
+
+    python benchmarks/bench_ingest.py [scale]
+"""
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from etl import load_source
+from sources import SOURCES
+from synthetic import DATE_WRITERS
+
+SCALE = 100
+
+
+def scaled_export(source, directory, scale):
+    """Writes the source repeated `scale` times with every copy shifted past the previous one"""
+    raw = pd.read_csv(source['path'], dtype=str)
+    dates = load_source(source).index
+    span = dates.max() - dates.min() + pd.Timedelta(days=1)
+
+    copies = []
+    for i in range(scale):
+        copy = raw.copy()
+        shifted = dates + span * i
+        for column, writer in DATE_WRITERS.items():
+            if column in copy:
+                copy[column] = writer(shifted)
+        copies.append(copy)
+
+    path = os.path.join(directory, os.path.basename(source['path']))
+    pd.concat(copies).to_csv(path, index=False)
+    return path
+
+
+def legacy_load(source, path):
+    """The loading steps analysis.py used before the typed ingestion layer"""
+    data = pd.read_csv(path, sep=',')
+    if 'UnixTimeStamp' in data and source['date_column'] == 'UnixTimeStamp':
+        data = data.drop(columns=['UnixTimeStamp'])
+    data = data.rename(columns=source['rename'])
+    date_column = 'Date(UTC)' if source['date_column'] == 'UnixTimeStamp' else source['date_column']
+    data[date_column] = pd.to_datetime(data[date_column]).dt.date
+    return data
+
+
+def typed_load(source, path):
+    return load_source(source, path)
+
+
+def measure(function, source, path):
+    """Returns the load time, the peak traced memory and the size of the loaded frame
+
+    The time is taken without tracemalloc running, since tracing slows down allocations."""
+    start = time.perf_counter()
+    data = function(source, path)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    data = function(source, path)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    size = data.memory_usage(deep=True).sum()
+    if isinstance(data.index, pd.DatetimeIndex):
+        size += data.index.memory_usage()
+    return elapsed, peak, size
+
+
+def main():
+    scale = int(sys.argv[1]) if len(sys.argv) > 1 else SCALE
+
+    print(f"{'source':<22} {'rows':>9} {'legacy s':>9} {'typed s':>8} {'legacy MB':>10} {'typed MB':>9} {'peak legacy MB':>15} {'peak typed MB':>14}")
+    with tempfile.TemporaryDirectory() as directory:
+        for source in SOURCES:
+            path = scaled_export(source, directory, scale)
+            rows = sum(1 for _ in open(path)) - 1
+            legacy = measure(legacy_load, source, path)
+            typed = measure(typed_load, source, path)
+            print(f"{source['name']:<22} {rows:>9} {legacy[0]:>9.3f} {typed[0]:>8.3f} {legacy[2] / 2**20:>10.1f} {typed[2] / 2**20:>9.1f} {legacy[1] / 2**20:>15.1f} {typed[1] / 2**20:>14.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+"""Startup time report of the app: import time of every page, broken down by package
+
+Every page module is imported in a fresh interpreter with `python -X importtime`, like a
+cold Streamlit worker rendering that page first. The import times are summed per
+top-level package, the median of --repeat runs is reported and written as JSON.
+
+Streamlit imports plotly itself, so plotly is part of every page's total, the Homepage's
+included. Only the packages the pages import themselves, such as pandas, pyarrow and
+scipy, are saved by opening a lighter page.
+
+Run from the repository root:
+
+    python benchmarks/startup.py [--repeat 5] [--top 10]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+
+from views import PAGES
+
+
+def import_times(statement):
+    """Runs an import statement in a fresh interpreter
+
+    Returns: dict of top-level package -> time spent importing its modules in seconds"""
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', statement], cwd=ROOT,
+                            capture_output=True, text=True, check=True)
+
+    packages = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        own, _, name = line[len('import time:'):].split('|')
+        # The own time of a module excludes the modules it imports, so every module counts once
+        package = name.strip().split('.')[0]
+        packages[package] = packages.get(package, 0) + int(own) / 1e6
+    return packages
+
+
+def page_report(module, repeat):
+    """Returns the median total and per package import time of a page module"""
+    runs = [import_times(f'import streamlit, app, {module}') for _ in range(repeat)]
+    names = set().union(*runs)
+    packages = {name: statistics.median(run.get(name, 0) for run in runs) for name in names}
+    total = statistics.median(sum(run.values()) for run in runs)
+    return total, dict(sorted(packages.items(), key=lambda item: item[1], reverse=True))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Reports the import time of every page of the app')
+    parser.add_argument('--repeat', type=int, default=3, help='runs per page, the median is reported')
+    parser.add_argument('--top', type=int, default=8, help='packages listed per page')
+    parser.add_argument('--output', default='benchmarks/startup.json', help='JSON file the report is written to')
+    args = parser.parse_args()
+
+    report = {}
+    for label, (module, _) in PAGES.items():
+        total, packages = page_report(module, args.repeat)
+        report[label] = {'module': module, 'total_seconds': total, 'packages': packages}
+
+        print(f"{label} ({module}): {total:.3f} s")
+        for package, seconds in list(packages.items())[:args.top]:
+            print(f"    {package:<24} {seconds:>7.3f} s")
+
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=4)
+    print(f'Report written to {args.output}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,256 @@
+"""Benchmark suite of the ETL, load and render paths on synthetic data scaled from the current dataset
+
+Every stage is timed at 1x, 10x, 100x and 1000x the size of the current daily history:
+
+    flatten   OwlracleConnection.flatten_json_data on a synthetic candle payload
+    ingest    etl.load_source on synthetic exports of every registered source
+    pipeline  the same ingestion as uncached load -> normalize branches of a Pipeline, run concurrently
+    merge     etl.join_sources of one frame per source
+    resample  etl.rollup of the merged data to every coarser resolution
+    summary   period_summary of the merged data
+    events    event_study of the merged data for 4 events and 5 windows
+    correlation  lagged cross-correlation of all pairs of merged columns over +-90 rows, before and after a split
+    load      etl.read_dataset of three columns from the columnar file
+    figures   decimated Plotly figures of the chart columns, serialized like Streamlit does
+
+The time is the best of --repeat runs, the peak memory is traced in a separate run.
+Everything runs offline. Results are written as JSON, and --compare flags the stages
+that got slower or use more memory than in a stored baseline (exit code 1).
+
+Run from the repository root:
+
+    python benchmarks/suite.py --output benchmarks/baseline.json
+    python benchmarks/suite.py --compare benchmarks/baseline.json
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from owlracle import OwlracleConnection
+from sources import SOURCES
+from pipeline import Pipeline, Stage
+from etl import load_source, read_source, normalize_source, join_sources, rollup, read_dataset, write_columnar, write_dataset, column_aggregations, pa
+from period_summary import period_summary
+from event_study import event_study, WINDOWS
+from cross_correlation import period_correlations
+from decimation import decimate
+from synthetic import DATE_WRITERS, synthetic_payload
+
+# Rows of the current daily history, 1x in the suite
+BASE_ROWS = 1100
+
+SCALES = [1, 10, 100, 1000]
+
+# Columns drawn by the Graphical Comparison page
+CHART_COLUMNS = ['average_gas_price', 'EthPriceCloseUSD', 'EthVolume', 'TransactionsAmount', 'UniqueAddressTotalCount',
+                 'DailyEthBurnt', 'BlockSize']
+CHART_POINT_BUDGET = 1500
+
+
+def synthetic_values(dtype, count, rng):
+    if np.dtype(dtype).kind == 'f':
+        return rng.gamma(2.0, 50.0, count)
+    return rng.integers(1, 1_000_000, count)
+
+
+def synthetic_export(source, directory, count, rng):
+    """Writes an export of a source with `count` rows in the source's own format
+
+    The dates cycle through the current daily history, so they stay in the range of the
+    original formats and the parsing work is the same as for real exports."""
+    days = pd.date_range('2020-01-01', periods=BASE_ROWS, freq='D')
+    dates = pd.DatetimeIndex(np.resize(days.to_numpy(), count))
+
+    columns = {source['date_column']: DATE_WRITERS[source['date_column']](dates)}
+    for column, dtype in source['dtypes'].items():
+        columns[column] = synthetic_values(dtype, count, rng)
+
+    path = os.path.join(directory, os.path.basename(source['path']))
+    pd.DataFrame(columns).to_csv(path, index=False)
+    return path
+
+
+def synthetic_frames(count, rng):
+    """Returns one frame per registered source as load_source returns them, on an hourly index
+
+    'inner' sources miss one row in a hundred and 'left' sources every other row, so the
+    join has rows to drop and to leave empty."""
+    index = pd.date_range('2000-01-01', periods=count, freq='h', name='Date')
+    frames = []
+    for source in SOURCES:
+        if source['how'] == 'inner':
+            frame_index = index[np.arange(count) % 100 != 0]
+        elif source['how'] == 'left':
+            frame_index = index[::2]
+        else:
+            frame_index = index
+        columns = {source['rename'].get(column, column): synthetic_values(dtype, len(frame_index), rng)
+                   for column, dtype in source['dtypes'].items()}
+        frame = pd.DataFrame(columns, index=frame_index)
+        if 'transform' in source:
+            frame = source['transform'](frame)
+        frames.append(frame)
+    return frames
+
+
+def build_figures(data):
+    """Builds the decimated chart of every chart column and serializes it to JSON"""
+    for column in CHART_COLUMNS:
+        x, y, _ = decimate(data.index.to_numpy(), data[column].to_numpy(), CHART_POINT_BUDGET)
+        fig = go.Figure()
+        fig.add_trace(go.Scatter(x=x, y=y, mode='lines', name=column, fill='tozeroy'))
+        fig.to_json()
+
+
+def prepare(scale, directory, rng):
+    """Generates the inputs of every stage at a scale, outside of the timed code
+
+    Returns: dict of stage name -> function running the stage"""
+    count = BASE_ROWS * scale
+    connection = OwlracleConnection.__new__(OwlracleConnection)
+    payload = synthetic_payload(count, rng)
+    exports = [(source, synthetic_export(source, directory, count, rng)) for source in SOURCES]
+
+    frames = synthetic_frames(count, rng)
+    merged, _ = join_sources(frames, SOURCES)
+    aggregations = column_aggregations(SOURCES)
+    split_date = merged.index[len(merged) // 2]
+    events = {f'event {i}': merged.index[len(merged) * i // 5] for i in range(1, 5)}
+
+    columnar = os.path.join(directory, 'data_complete.feather')
+    csv = os.path.join(directory, 'data_complete.csv')
+    if pa is not None:
+        write_columnar(merged, columnar)
+    else:
+        write_dataset(merged, csv)
+
+    branches = []
+    for source, path in exports:
+        branches.append(Stage(f"load_{source['name']}", read_source, args=(source, path), files=[path], cache=False))
+        branches.append(Stage(f"normalize_{source['name']}", normalize_source, inputs=[f"load_{source['name']}"], args=(source,), cache=False))
+    ingest_pipeline = Pipeline(branches, directory)
+
+    return {
+        'flatten': lambda: connection.flatten_json_data(payload),
+        'ingest': lambda: [load_source(source, path) for source, path in exports],
+        'pipeline': lambda: ingest_pipeline.run(),
+        'merge': lambda: join_sources(frames, SOURCES),
+        'resample': lambda: [rollup(merged, level, aggregations) for level in ('D', 'W', 'ME')],
+        'summary': lambda: period_summary(merged, split_date),
+        'events': lambda: event_study(merged, events, WINDOWS),
+        'correlation': lambda: period_correlations(merged, split_date, 90),
+        'load': lambda: read_dataset(CHART_COLUMNS[:3], columnar, csv),
+        'figures': lambda: build_figures(merged),
+    }
+
+
+def measure(function, repeat):
+    """Returns (best time in seconds, peak traced memory in MB)
+
+    The time is taken without tracemalloc running, since tracing slows down allocations.
+    Memory allocated by Arrow's own allocator is not traced."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    function()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return min(times), peak / 2**20
+
+
+def run(scales, stages, repeat, seed=0):
+    """Runs the stages at every scale
+
+    Returns: list of result dicts with scale, rows, stage, seconds and peak_mb"""
+    rng = np.random.default_rng(seed)
+    results = []
+    for scale in scales:
+        with tempfile.TemporaryDirectory() as directory:
+            functions = prepare(scale, directory, rng)
+            for stage in stages:
+                seconds, peak = measure(functions[stage], repeat)
+                results.append({'scale': scale, 'rows': BASE_ROWS * scale, 'stage': stage, 'seconds': seconds, 'peak_mb': peak})
+                print(f"{scale:>5}x {stage:<11} {seconds:>9.4f} s {peak:>9.1f} MB", flush=True)
+    return results
+
+
+def compare(results, baseline, threshold, min_seconds=0.005):
+    """Returns the results that are slower or use more memory than the baseline
+
+    A stage regresses when its time or peak memory grows by more than `threshold`
+    (relative). Times below min_seconds are too noisy to compare."""
+    previous = {(entry['scale'], entry['stage']): entry for entry in baseline['results']}
+    regressions = []
+    for entry in results:
+        old = previous.get((entry['scale'], entry['stage']))
+        if old is None:
+            continue
+        slower = entry['seconds'] > old['seconds'] * (1 + threshold) and entry['seconds'] - old['seconds'] > min_seconds
+        larger = entry['peak_mb'] > old['peak_mb'] * (1 + threshold) and entry['peak_mb'] - old['peak_mb'] > 1
+        if slower or larger:
+            regressions.append({**entry, 'baseline_seconds': old['seconds'], 'baseline_peak_mb': old['peak_mb']})
+    return regressions
+
+
+def main():
+    stages = ['flatten', 'ingest', 'pipeline', 'merge', 'resample', 'summary', 'events', 'correlation', 'load', 'figures']
+
+    parser = argparse.ArgumentParser(description='Benchmarks the ETL, load and render paths on synthetic data')
+    parser.add_argument('--scales', default=','.join(map(str, SCALES)), help='comma separated multiples of the current data size')
+    parser.add_argument('--stages', default=','.join(stages), help='comma separated stages to run')
+    parser.add_argument('--repeat', type=int, default=3, help='timed runs per stage, the best is kept')
+    parser.add_argument('--output', default='benchmarks/results.json', help='JSON file the results are written to')
+    parser.add_argument('--compare', metavar='BASELINE', help='JSON results of a previous run to compare against')
+    parser.add_argument('--threshold', type=float, default=0.25, help='relative slowdown or memory growth reported as a regression')
+    args = parser.parse_args()
+
+    # Read the baseline before anything is written, --output may be the same file
+    baseline = None
+    if args.compare:
+        with open(args.compare, 'r') as f:
+            baseline = json.load(f)
+
+    results = run([int(scale) for scale in args.scales.split(',')], args.stages.split(','), args.repeat)
+
+    report = {
+        'created': pd.Timestamp.now(tz='UTC').isoformat(),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'pyarrow': pa.__version__ if pa is not None else None,
+        'machine': platform.machine(),
+        'cpus': os.cpu_count(),
+        'results': results,
+    }
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=4)
+    print(f'Results written to {args.output}')
+
+    if baseline is not None:
+        regressions = compare(results, baseline, args.threshold)
+        for entry in regressions:
+            print(f"Regression: {entry['stage']} at {entry['scale']}x took {entry['seconds']:.4f} s "
+                  f"(baseline {entry['baseline_seconds']:.4f} s), peak {entry['peak_mb']:.1f} MB "
+                  f"(baseline {entry['baseline_peak_mb']:.1f} MB)")
+        if regressions:
+            sys.exit(1)
+        print(f'No regressions against {args.compare}')
+
+
+if __name__ == '__main__':
+    main()
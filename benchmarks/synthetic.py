@@ -0,0 +1,24 @@
+"""Synthetic data shared by the benchmark scripts"""
+import numpy as np
+import pandas as pd
+
+# How every date-like column of the exports is written
+DATE_WRITERS = {
+    'Timestamp': lambda dates: dates.strftime('%Y-%m-%dT%H:%M:%S.000Z'),
+    'Date': lambda dates: dates.strftime('%Y-%m-%d'),
+    'Date(UTC)': lambda dates: dates.strftime('%m/%d/%Y'),
+    'UnixTimeStamp': lambda dates: dates.as_unit('s').asi8,
+}
+
+
+def synthetic_payload(count, rng=None):
+    """Returns an Owlracle history payload with `count` candles, newest first
+
+    rng: numpy Generator of the gas prices, a fixed seed by default"""
+    rng = rng if rng is not None else np.random.default_rng(0)
+    timestamps = pd.date_range('2000-01-01', periods=count, freq='min').strftime('%Y-%m-%dT%H:%M:%S.308Z')
+    prices = rng.gamma(2.0, 20.0, (count, 4)).tolist()
+    candles = [{'timestamp': timestamp, 'gasPrice': {'open': o, 'close': c, 'low': l, 'high': h},
+                'avgGas': 127823.31, 'samples': 1439}
+               for timestamp, (o, c, l, h) in zip(timestamps, prices)]
+    return {'candles': candles[::-1]}
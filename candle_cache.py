@@ -0,0 +1,179 @@
+import sqlite3
+import time
+from contextlib import contextmanager
+import pandas as pd
+
+CANDLE_COLUMNS = ['GasPriceOpen', 'GasPriceClose', 'GasPriceLow', 'GasPriceHigh', 'avgGas', 'Samples']
+
+class CandleCache:
+    """On-disk candle store in front of an OwlracleConnection
+
+    Candles are kept in a SQLite file keyed by (network, timeframe, slot), where the slot
+    is the start of the candle's timeframe bucket. A range request only asks the API for
+    the slots that are not stored yet and serves everything else from disk."""
+
+    def __init__(self, connection, path='data/candles.sqlite', max_age=None, max_rows=None):
+        """connection: OwlracleConnection used to fetch missing candles
+        path: location of the SQLite file
+        max_age: seconds of history kept, candles whose slot is older are evicted (None keeps them forever)
+        max_rows: maximum number of stored candles, the oldest slots are evicted first
+
+        Closed candles never change, so they are evicted by their own timestamp rather than
+        by when they were fetched: the history kept is only fetched once."""
+        self.connection = connection
+        self.path = path
+        self.max_age = max_age
+        self.max_rows = max_rows
+        self._create_tables()
+
+    @contextmanager
+    def _connect(self):
+        db = sqlite3.connect(self.path)
+        try:
+            with db:
+                yield db
+        finally:
+            db.close()
+
+    def _create_tables(self):
+        with self._connect() as db:
+            db.execute("""CREATE TABLE IF NOT EXISTS candles (
+                network TEXT, timeframe INTEGER, slot INTEGER, timestamp TEXT,
+                GasPriceOpen REAL, GasPriceClose REAL, GasPriceLow REAL, GasPriceHigh REAL,
+                avgGas REAL, Samples INTEGER, fetched_at REAL,
+                PRIMARY KEY (network, timeframe, slot))""")
+            # Slots the API was asked for but had no candle for, so they are not requested again
+            db.execute("""CREATE TABLE IF NOT EXISTS empty_slots (
+                network TEXT, timeframe INTEGER, slot INTEGER, fetched_at REAL,
+                PRIMARY KEY (network, timeframe, slot))""")
+
+    def _slot_range(self, from_time, to_time, timeframe):
+        """Returns the start of every timeframe bucket overlapping from_time..to_time"""
+        step = timeframe * 60
+        first = from_time // step * step
+        return list(range(first, to_time + 1, step))
+
+    def _stored_slots(self, db, network, timeframe, first, last):
+        slots = set()
+        for table in ('candles', 'empty_slots'):
+            rows = db.execute(f"SELECT slot FROM {table} WHERE network=? AND timeframe=? AND slot BETWEEN ? AND ?",
+                              (network, timeframe, first, last))
+            slots.update(row[0] for row in rows)
+        return slots
+
+    def missing_intervals(self, network, from_time, to_time, timeframe=1440):
+        """Returns the (from, to) unix time intervals that are not stored yet"""
+        step = timeframe * 60
+        slots = self._slot_range(from_time, to_time, timeframe)
+        if not slots:
+            return []
+
+        with self._connect() as db:
+            stored = self._stored_slots(db, network, timeframe, slots[0], slots[-1])
+
+        # Merge consecutive missing slots into one interval each
+        intervals = []
+        for slot in slots:
+            if slot in stored:
+                continue
+            if intervals and intervals[-1][1] == slot:
+                intervals[-1][1] = slot + step
+            else:
+                intervals.append([slot, slot + step])
+
+        return [(max(start, from_time), min(end, to_time)) for start, end in intervals]
+
+    def store(self, network, timeframe, data, from_time=None, to_time=None):
+        """Writes fetched candles to the store
+
+        Closed slots lying wholly between from_time and to_time without a candle are remembered
+        as empty. A slot the range only partly covers is not: the API stamps a candle inside its
+        slot (daily candles at about 23:00), so a range ending mid-slot can miss an existing
+        candle. The bucket that is still running is never stored, so it is fetched again next time."""
+        step = timeframe * 60
+        now = time.time()
+        closed = lambda slot: slot + step <= now
+
+        slots = []
+        rows = []
+        if len(data) > 0:
+            timestamps = pd.to_datetime(data['Timestamp'], utc=True)
+            epochs = (timestamps - pd.Timestamp(0, tz='UTC')) // pd.Timedelta(seconds=1)
+            slots = (epochs // step * step).tolist()
+
+            # Keep the API's ISO format so cached and hand-saved histories look the same
+            iso_timestamps = timestamps.dt.strftime('%Y-%m-%dT%H:%M:%S.%f').str[:-3] + 'Z'
+
+            for slot, timestamp, values in zip(slots, iso_timestamps, data[CANDLE_COLUMNS].itertuples(index=False)):
+                if closed(slot):
+                    rows.append((network, timeframe, slot, timestamp, *values, now))
+
+        empty = []
+        if from_time is not None and to_time is not None:
+            found = set(slots)
+            empty = [(network, timeframe, slot, now) for slot in self._slot_range(from_time, to_time, timeframe)
+                     if slot not in found and closed(slot) and slot >= from_time and slot + step - 1 <= to_time]
+
+        with self._connect() as db:
+            db.executemany("INSERT OR REPLACE INTO candles VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+            db.executemany("INSERT OR REPLACE INTO empty_slots VALUES (?, ?, ?, ?)", empty)
+
+    def evict(self):
+        """Removes the candles older than max_age and trims the store to the newest max_rows slots
+
+        The empty slot markers are trimmed the same way, and the markers older than every
+        candle left of their network and timeframe are dropped with the candles, so they
+        never hide candles that would have to be fetched again."""
+        with self._connect() as db:
+            if self.max_age is not None:
+                cutoff = time.time() - self.max_age
+                db.execute("DELETE FROM candles WHERE slot < ?", (cutoff,))
+                db.execute("DELETE FROM empty_slots WHERE slot < ?", (cutoff,))
+            if self.max_rows is not None:
+                trimmed = db.execute("""DELETE FROM candles WHERE rowid IN (
+                    SELECT rowid FROM candles ORDER BY slot DESC LIMIT -1 OFFSET ?)""", (self.max_rows,)).rowcount
+                db.execute("""DELETE FROM empty_slots WHERE rowid IN (
+                    SELECT rowid FROM empty_slots ORDER BY slot DESC LIMIT -1 OFFSET ?)""", (self.max_rows,))
+                if trimmed:
+                    db.execute("""DELETE FROM empty_slots WHERE slot < (
+                        SELECT MIN(slot) FROM candles WHERE candles.network = empty_slots.network
+                        AND candles.timeframe = empty_slots.timeframe)""")
+
+    def load(self, network, from_time, to_time, timeframe=1440):
+        """Returns the stored candles for the time period, newest first"""
+        slots = self._slot_range(from_time, to_time, timeframe)
+        if not slots:
+            slots = [from_time]
+        with self._connect() as db:
+            data = pd.read_sql_query(f"""SELECT timestamp AS Timestamp, {', '.join(CANDLE_COLUMNS)} FROM candles
+                WHERE network=? AND timeframe=? AND slot BETWEEN ? AND ? ORDER BY slot DESC""",
+                db, params=(network, timeframe, slots[0], slots[-1]))
+        return data
+
+    def fetch_missing(self, network, from_time, to_time, timeframe=1440):
+        """Fetches and stores the candles of the time period that are not stored yet
+
+        Returns: False if the API did not answer, True otherwise"""
+        for start, end in self.missing_intervals(network, from_time, to_time, timeframe):
+            data = self.connection.get_gas_price_history(network, start, end, timeframe=timeframe)
+            if data is None:
+                return False
+            self.store(network, timeframe, data, start, end)
+        return True
+
+    def get_average_gas_price(self, network, from_time, to_time, timeframe=1440):
+        """Returns the gas price history for a time period, fetching only the missing candles
+
+        network: 'eth' or 'bsc'
+        from_time: unix timestamp
+        to_time: unix timestamp
+        timeframe: timeframe of the candles in minutes
+
+        Returns: pandas dataframe, newest candle first"""
+        if not self.fetch_missing(network, from_time, to_time, timeframe):
+            return None
+
+        data = self.load(network, from_time, to_time, timeframe)
+        self.evict()
+
+        return data
@@ -0,0 +1,123 @@
+import numpy as np
+import pandas as pd
+
+# Fewest overlapping pairs of values a correlation is computed from, fewer give NaN
+MIN_OVERLAP = 10
+
+
+def _fft_length(max_lag, rows):
+    """Returns the FFT length of the blocks: a power of two holding a few times the lag range"""
+    span = 2 * max_lag + 1
+    length = 1 << int(np.ceil(np.log2(max(4 * span, 64))))
+    # A short series fits in one block, no need for a longer transform
+    return min(length, 1 << int(np.ceil(np.log2(rows + 2 * max_lag + 1))))
+
+
+def _lagged_products(values, max_lag):
+    """Returns sum over t of values[t, i] * values[t + lag, j] for every lag in -max_lag..max_lag and pair i, j
+
+    The rows are split into blocks. Every block is correlated with the block extended by
+    max_lag rows on both sides through one FFT per column, and the cross spectra of all
+    column pairs are summed over the blocks with one matrix product per frequency. A single
+    inverse FFT per pair then gives every lag at once.
+
+    values: (rows, columns) array, missing values set to 0
+
+    Returns: (2 * max_lag + 1, columns, columns) array, lag -max_lag first"""
+    rows, columns = values.shape
+    length = _fft_length(max_lag, rows)
+    block = length - 2 * max_lag
+    blocks = -(-rows // block)
+
+    # max_lag zeros on both sides, and up to a whole number of blocks
+    padded = np.zeros((blocks * block + 2 * max_lag, columns))
+    padded[max_lag:max_lag + rows] = values
+
+    leading = padded[max_lag:max_lag + blocks * block].reshape(blocks, block, columns)
+    following = np.lib.stride_tricks.sliding_window_view(padded, block + 2 * max_lag, axis=0)[::block][:blocks]
+
+    # Spectra of shape (blocks, columns, frequencies)
+    leading_spectra = np.fft.rfft(leading.transpose(0, 2, 1), n=length, axis=-1)
+    following_spectra = np.fft.rfft(following, n=length, axis=-1)
+
+    # Cross spectrum of every pair summed over the blocks: (frequencies, columns, columns)
+    cross = np.conj(leading_spectra).transpose(2, 1, 0) @ following_spectra.transpose(2, 0, 1)
+
+    # Shift d of the circular correlation is the lag d - max_lag, the transform runs over contiguous rows
+    correlations = np.fft.irfft(np.ascontiguousarray(cross.transpose(1, 2, 0)), n=length, axis=-1)
+    return correlations[:, :, :2 * max_lag + 1].transpose(2, 0, 1)
+
+
+def lagged_correlations(data, max_lag=30, differences=False):
+    """Correlates every column of the data with every column shifted by -max_lag..max_lag rows
+
+    The value at (lag, leader, follower) is the correlation of leader[t] with
+    follower[t + lag], so a peak at a positive lag means the leader moves first. The
+    columns are standardized once with their own mean and standard deviation, the
+    products and the number of overlapping present values of all pairs and lags are
+    computed in one batch with FFTs (see _lagged_products). Missing values are skipped.
+
+    data: dataframe of numeric columns with a sorted index of equally spaced rows
+    max_lag: largest shift in rows
+    differences: correlate the changes from one row to the next instead of the values,
+    which removes the common trend of series that all grow over time
+
+    Returns: dataframe indexed by (lag, leader) with one column per follower"""
+    numeric = data.select_dtypes('number')
+    if differences:
+        numeric = numeric.diff().iloc[1:]
+    values = numeric.to_numpy(dtype=np.float64)
+    present = ~np.isnan(values)
+    max_lag = max(0, min(max_lag, len(values) - 1))
+
+    # Columns without any value in the period get NaN statistics and no correlations
+    counts = present.sum(axis=0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = np.where(present, values, 0.0).sum(axis=0) / counts
+        std = np.sqrt(np.where(present, (values - mean) ** 2, 0.0).sum(axis=0) / counts)
+        standardized = np.where(present, (values - mean) / std, 0.0)
+
+    products = _lagged_products(standardized, max_lag)
+    overlaps = np.rint(_lagged_products(present.astype(np.float64), max_lag))
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        correlations = np.where(overlaps >= MIN_OVERLAP, products / overlaps, np.nan)
+
+    # Constant columns have no correlation
+    correlations[:, std == 0, :] = np.nan
+    correlations[:, :, std == 0] = np.nan
+
+    lags = np.arange(-max_lag, max_lag + 1)
+    index = pd.MultiIndex.from_product([lags, numeric.columns], names=['lag', 'leader'])
+    return pd.DataFrame(correlations.reshape(-1, len(numeric.columns)), index=index,
+                        columns=pd.Index(numeric.columns, name='follower'))
+
+
+def period_correlations(data, split_date, max_lag=30, differences=False):
+    """Returns the lagged correlations of the rows before and after the split date, see lagged_correlations
+
+    Returns: dataframe indexed by (period, lag, leader), period being 'before' or 'after'"""
+    split = data.index.searchsorted(split_date)
+    return pd.concat({'before': lagged_correlations(data.iloc[:split], max_lag, differences),
+                      'after': lagged_correlations(data.iloc[split:], max_lag, differences)}, names=['period'])
+
+
+def peak_lags(correlations):
+    """Returns the lag of the strongest correlation, positive or negative, of every pair
+
+    correlations: dataframe returned by lagged_correlations
+
+    Returns: dataframe indexed by (leader, follower) with the lag and the correlation at it"""
+    lags = correlations.index.unique('lag')
+    leaders = correlations.index.unique('leader')
+    values = correlations.to_numpy().reshape(len(lags), len(leaders), -1)
+
+    # Pairs without any correlation keep a NaN lag
+    strength = np.where(np.isnan(values), -1.0, np.abs(values))
+    best = strength.argmax(axis=0)
+    found = strength.max(axis=0) >= 0
+    peak = np.take_along_axis(values, best[None], axis=0)[0]
+
+    index = pd.MultiIndex.from_product([leaders, correlations.columns], names=['leader', 'follower'])
+    return pd.DataFrame({'lag': np.where(found, lags.to_numpy()[best], np.nan).ravel(),
+                         'correlation': np.where(found, peak, np.nan).ravel()}, index=index)
@@ -0,0 +1,82 @@
+import numpy as np
+
+
+def _as_numbers(x):
+    """Returns x as float64, datetimes as nanoseconds since the epoch"""
+    x = np.asarray(x)
+    if np.issubdtype(x.dtype, np.datetime64):
+        return x.astype('datetime64[ns]').astype(np.int64).astype(np.float64)
+    return x.astype(np.float64)
+
+
+def lttb(x, y, threshold):
+    """Largest-Triangle-Three-Buckets downsampling
+
+    Keeps the first and last point and, for every one of threshold - 2 equally sized
+    buckets in between, the point forming the largest triangle with the point kept in
+    the previous bucket and the average of the next bucket. This preserves the visual
+    shape of a line much better than taking every n-th point.
+
+    x: sorted x values (numbers or datetime64)
+    y: y values without NaN
+    threshold: number of points to keep
+
+    Returns: indices of the kept points"""
+    count = len(y)
+    if threshold >= count or threshold < 3:
+        return np.arange(count)
+
+    x = _as_numbers(x)
+    y = np.asarray(y, dtype=np.float64)
+
+    # Bucket boundaries, the first and last point form buckets of their own
+    every = (count - 2) / (threshold - 2)
+    edges = np.floor(np.arange(threshold - 1) * every).astype(np.int64) + 1
+    edges = np.append(edges, count)
+
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = count - 1
+
+    previous = 0
+    for bucket in range(threshold - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        next_start, next_end = edges[bucket + 1], edges[bucket + 2]
+        next_x = x[next_start:next_end].mean()
+        next_y = y[next_start:next_end].mean()
+
+        area = np.abs((x[previous] - next_x) * (y[start:end] - y[previous])
+                      - (x[previous] - x[start:end]) * (next_y - y[previous]))
+        previous = start + int(np.argmax(area))
+        selected[bucket + 1] = previous
+
+    return selected
+
+
+def envelope(x, y, buckets):
+    """Returns the minimum and maximum of y in equally sized buckets
+
+    Drawn as a band behind the decimated line, it shows the spikes LTTB leaves out.
+
+    Returns: (x of the first point of every bucket, minimum, maximum)"""
+    y = np.asarray(y, dtype=np.float64)
+    edges = np.unique(np.linspace(0, len(y), buckets + 1).astype(np.int64)[:-1])
+    return np.asarray(x)[edges], np.minimum.reduceat(y, edges), np.maximum.reduceat(y, edges)
+
+
+def decimate(x, y, budget):
+    """Reduces a series to at most `budget` points for plotting
+
+    Missing values are dropped before downsampling.
+
+    Returns: (x, y, decimated) where decimated tells if points were removed"""
+    x = np.asarray(x)
+    y = np.asarray(y, dtype=np.float64)
+    present = ~np.isnan(y)
+    x, y = x[present], y[present]
+
+    if len(y) <= budget:
+        return x, y, False
+
+    kept = lttb(x, y, budget)
+    return x[kept], y[kept], True
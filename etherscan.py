@@ -0,0 +1,150 @@
+import csv
+import os
+from datetime import date, datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
+import yaml
+import requests
+from ratelimit import TokenBucket
+
+ETHERSCAN_BASE_URL = 'https://api.etherscan.io/api'
+
+# Seconds to wait for a single chart request before giving up
+REQUEST_TIMEOUT = 30
+
+# Calls per second allowed by the Etherscan API plan. The daily statistics endpoints of
+# ETHERSCAN_SERIES are API PRO endpoints: a free key is rejected with status '0', so the key
+# must be a PRO key, set this to its plan's rate
+RATE_LIMIT = 5
+
+# First day of the Ethereum chain, the default start of a full refresh
+CHAIN_START = '2015-07-30'
+
+# Chart series fetched from the daily statistics endpoints: name -> (action, result field, file, value header)
+# Every file is written in the format of the CSV exported from https://etherscan.io/charts,
+# the format its source in sources.py reads
+ETHERSCAN_SERIES = {
+    'tx_growth': ('dailytx', 'transactionCount', 'data/export-TxGrowth.csv', 'Value'),
+    'block_size': ('dailyavgblocksize', 'blockSize_bytes', 'data/export-BlockSize.csv', 'Value'),
+    'avg_gas_price': ('dailyavggasprice', 'avgGasPrice_Wei', 'data/export-AvgGasPrice.csv', 'Value (Wei)'),
+}
+
+
+class EtherscanConnection:
+    def __init__(self, config_file='config.yaml', base_url=ETHERSCAN_BASE_URL, max_workers=len(ETHERSCAN_SERIES), limiter=None):
+        """limiter: TokenBucket shared by every request, defaults to RATE_LIMIT calls per second"""
+        self.config = self._load_config(config_file)
+        self.api_key = self._load_api_key()
+        self.base_url = base_url
+        self.max_workers = max_workers
+        self.limiter = limiter or TokenBucket(RATE_LIMIT)
+        self.session = self._create_session()
+
+    def _load_config(self, config_file):
+        try:
+            with open(config_file, 'r') as f:
+                config = yaml.load(f, Loader=yaml.FullLoader)
+            return config
+        except FileNotFoundError:
+            print("Error: Config file not found")
+            return None
+
+    def _load_api_key(self):
+        if self.config is None:
+            return None
+        api_key = self.config.get("keys", {}).get("etherscan_api")
+        if api_key:
+            return api_key
+        else:
+            print("Error: Etherscan API key not found in config")
+            return None
+
+    def _create_session(self):
+        """Creates a keep-alive session whose connection pool fits the concurrency limit"""
+        session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=self.max_workers)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
+
+    def _fetch_series(self, action, start_date, end_date):
+        """Fetches the daily rows of one chart, raising on HTTP and API errors"""
+        params = {'module': 'stats', 'action': action, 'startdate': start_date, 'enddate': end_date,
+                  'sort': 'asc', 'apikey': self.api_key}
+
+        # Every worker waits for its turn in the shared rate limit
+        self.limiter.acquire()
+        res = self.session.get(self.base_url, params=params, timeout=REQUEST_TIMEOUT)
+        res.raise_for_status()
+
+        # Etherscan answers errors with HTTP 200, status '0' and the reason in 'result',
+        # e.g. when a free key asks for an API PRO endpoint
+        data = res.json()
+        if str(data.get('status')) != '1':
+            raise ValueError(f"rejected by the API: {data.get('result') or data.get('message')}")
+        return data['result']
+
+    def get_series(self, name, start_date=CHAIN_START, end_date=None):
+        """Returns the daily values of a chart series
+
+        name: key of ETHERSCAN_SERIES
+        start_date: first day, 'YYYY-MM-DD'
+        end_date: last day, 'YYYY-MM-DD', defaults to today
+
+        Returns: list of (unix timestamp, value) tuples, oldest first"""
+        if self.api_key is None:
+            print("Error: Etherscan API key not loaded")
+            return None
+
+        action, field = ETHERSCAN_SERIES[name][:2]
+        try:
+            rows = self._fetch_series(action, start_date, end_date or date.today().isoformat())
+            return [(int(row['unixTimeStamp']), row[field]) for row in rows]
+        except (requests.RequestException, ValueError, KeyError) as e:
+            print(f"Error: Etherscan series {name} ({action}) could not be fetched, {e}")
+            return None
+
+    def fetch_all(self, names=None, start_date=CHAIN_START, end_date=None):
+        """Fetches several chart series concurrently, one request per series
+
+        names: keys of ETHERSCAN_SERIES, defaults to all of them
+
+        Returns: dict of name -> list of (unix timestamp, value), None for the series that failed"""
+        names = list(names or ETHERSCAN_SERIES)
+        if self.api_key is None:
+            print("Error: Etherscan API key not loaded")
+            return dict.fromkeys(names)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            results = executor.map(lambda name: self.get_series(name, start_date, end_date), names)
+            return dict(zip(names, results))
+
+    def refresh_exports(self, names=None, start_date=CHAIN_START, end_date=None):
+        """Fetches chart series and overwrites their export files
+
+        A file is only replaced once its series was fetched completely, the files of the
+        series that failed are left as they are.
+
+        Returns: list of the names whose files were written"""
+        written = []
+        for name, rows in self.fetch_all(names, start_date, end_date).items():
+            if rows:
+                path, header = ETHERSCAN_SERIES[name][2:]
+                write_export(rows, path, header)
+                written.append(name)
+        return written
+
+
+def write_export(rows, path, header='Value'):
+    """Writes (unix timestamp, value) rows in the format of an Etherscan chart export
+
+    The file is written next to the old one and moved over it, so a reader never sees half a file."""
+    temporary_path = path + '.tmp'
+    with open(temporary_path, 'w', newline='') as f:
+        writer = csv.writer(f, quoting=csv.QUOTE_ALL, lineterminator='\n')
+        writer.writerow(['Date(UTC)', 'UnixTimeStamp', header])
+        for timestamp, value in rows:
+            day = datetime.fromtimestamp(timestamp, timezone.utc).date()
+            # Etherscan writes the days without leading zeros, e.g. 6/17/2023
+            writer.writerow([f'{day.month}/{day.day}/{day.year}', timestamp, value])
+    os.replace(temporary_path, path)
+
@@ -0,0 +1,459 @@
+import hashlib
+import json
+import os
+import numpy as np
+import pandas as pd
+
+from sources import SOURCES
+from pipeline import Pipeline, Stage, PIPELINE_CACHE_DIRECTORY
+
+# pyarrow is optional, without it the sources are parsed by pandas
+# and the columnar copy of the merged dataset is not written
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    import pyarrow.feather as pa_feather
+except ImportError:
+    pa = None
+
+# Largest relative error accepted when a float column is stored as float32
+FLOAT32_TOLERANCE = 1e-6
+
+# Resolutions precomputed by build_rollups: pandas frequency -> (label, nominal length)
+# Levels finer than the dataset itself are skipped
+ROLLUP_LEVELS = {
+    'h': ('Hourly', pd.Timedelta(hours=1)),
+    'D': ('Daily', pd.Timedelta(days=1)),
+    'W': ('Weekly', pd.Timedelta(days=7)),
+    'ME': ('Monthly', pd.Timedelta(days=30)),
+}
+
+
+def _read_csv_arrow(path, source):
+    """Reads the typed columns of a source with pyarrow's multithreaded CSV parser
+
+    The date strings are parsed by Arrow's C parser, which is much faster than the
+    strptime fallback pandas uses for non-ISO formats like '%m/%d/%Y'."""
+    date_column = source['date_column']
+    column_types = {column: pa.from_numpy_dtype(np.dtype(dtype)) for column, dtype in source['dtypes'].items()}
+    timestamp_parsers = None
+
+    if 'date_unit' in source:
+        column_types[date_column] = pa.int64()
+    elif source['date_format'] == 'ISO8601':
+        column_types[date_column] = pa.timestamp('ms', tz='UTC')
+        timestamp_parsers = [pa_csv.ISO8601]
+    else:
+        column_types[date_column] = pa.timestamp('s')
+        timestamp_parsers = [source['date_format']]
+
+    options = pa_csv.ConvertOptions(include_columns=[date_column, *source['dtypes']], column_types=column_types,
+                                    timestamp_parsers=timestamp_parsers)
+    return pa_csv.read_csv(path, convert_options=options).to_pandas()
+
+
+def _read_csv_pandas(path, source):
+    """Reads the typed columns of a source with pandas, used when pyarrow is not installed"""
+    date_column = source['date_column']
+    dtypes = dict(source['dtypes'])
+    if 'date_unit' in source:
+        dtypes[date_column] = 'int64'
+
+    data = pd.read_csv(path, usecols=[date_column, *source['dtypes']], dtype=dtypes)
+    if 'date_unit' not in source:
+        data[date_column] = pd.to_datetime(data[date_column], format=source['date_format'], utc=source['date_format'] == 'ISO8601')
+    return data
+
+
+def read_source(source, path=None):
+    """Reads the date column and the typed columns of a registered source
+
+    Only the date column and the columns listed in the source's dtypes are parsed, each
+    with its declared dtype.
+
+    source: entry of sources.SOURCES
+    path: file to read instead of the registered path
+
+    Returns: pandas dataframe with the columns as they are named in the file"""
+    path = path or source['path']
+    return _read_csv_arrow(path, source) if pa is not None else _read_csv_pandas(path, source)
+
+
+def normalize_source(data, source):
+    """Renames the columns of a read source and indexes it by calendar day
+
+    The date is parsed with its exact format, or converted from the unix timestamp
+    column, straight into a datetime64 index. The source's transform is applied last.
+
+    Returns: pandas dataframe with a DatetimeIndex named 'Date'"""
+    data = data.rename(columns=source['rename'])
+
+    # Keep only the calendar day of every row
+    dates = data.pop(source['date_column'])
+    if 'date_unit' in source:
+        dates = pd.to_datetime(dates, unit=source['date_unit'])
+    elif dates.dt.tz is not None:
+        dates = dates.dt.tz_localize(None)
+    data.index = pd.DatetimeIndex(dates.dt.normalize(), name='Date').as_unit('ns')
+
+    if 'transform' in source:
+        data = source['transform'](data)
+
+    return data
+
+
+def load_source(source, path=None):
+    """Loads one registered source into a dataframe indexed by calendar day
+
+    source: entry of sources.SOURCES
+    path: file to read instead of the registered path
+
+    Returns: pandas dataframe with a DatetimeIndex named 'Date'"""
+    return normalize_source(read_source(source, path), source)
+
+
+def join_sources(frames, sources=SOURCES):
+    """Aligns all sources on the dates of the base source in a single pass
+
+    The rows kept are the base rows whose date is present in every 'inner' source. Every
+    other source is then reindexed once onto those dates and the columns are concatenated,
+    instead of merging the growing frame source by source.
+
+    frames: dataframes returned by load_source, in the order of sources
+    sources: the source registry, the first entry is the base
+
+    Returns: (merged dataframe, dict of rows dropped per source name)"""
+    base = frames[0]
+
+    # Dates kept in the output, in the order of the base source
+    keep = np.ones(len(base), dtype=bool)
+    for frame, source in zip(frames[1:], sources[1:]):
+        if source['how'] == 'inner':
+            keep &= base.index.isin(frame.index)
+        elif source['how'] != 'left':
+            raise ValueError(f"Unknown join kind '{source['how']}' for source '{source['name']}'")
+    index = base.index[keep]
+
+    aligned = [base[keep]]
+    dropped = {sources[0]['name']: int(len(base) - keep.sum())}
+
+    for frame, source in zip(frames[1:], sources[1:]):
+        if frame.index.has_duplicates:
+            print(f"Warning: source '{source['name']}' has duplicate dates, keeping the first row of each")
+            frame = frame[~frame.index.duplicated()]
+        aligned.append(frame.reindex(index))
+        dropped[source['name']] = int(len(frame) - frame.index.isin(index).sum())
+
+    merged = pd.concat(aligned, axis=1)
+
+    return merged, dropped
+
+
+def build_dataset(sources=SOURCES):
+    """Loads and joins every registered source
+
+    Returns: (merged dataframe, dict of rows dropped per source name)"""
+    frames = [load_source(source) for source in sources]
+    merged, dropped = join_sources(frames, sources)
+    return merged.sort_index(kind='stable'), dropped
+
+
+def write_dataset(data, path='data/data_complete.csv', append=False):
+    """Saves the merged dataset with the dates as the first column
+
+    append: add the rows to the end of an existing file instead of replacing it"""
+    data.to_csv(path, index_label='Date', date_format='%Y-%m-%d', mode='a' if append else 'w', header=not append)
+
+
+def compact_dtypes(data):
+    """Returns the dataset with float32 and int32 columns wherever the values allow it
+
+    A float column is stored as float32 only if no value moves by more than
+    FLOAT32_TOLERANCE relative to itself, an integer column as int32 if it fits."""
+    columns = {}
+    for column, values in data.items():
+        if pd.api.types.is_float_dtype(values):
+            narrow = values.astype('float32')
+            if np.allclose(narrow.to_numpy(dtype='float64'), values.to_numpy(), rtol=FLOAT32_TOLERANCE, atol=0, equal_nan=True):
+                values = narrow
+        elif pd.api.types.is_integer_dtype(values):
+            info = np.iinfo('int32')
+            if len(values) == 0 or (values.min() >= info.min and values.max() <= info.max):
+                values = values.astype('int32')
+        columns[column] = values
+    return pd.DataFrame(columns, index=data.index)
+
+
+def write_columnar(data, path='data/data_complete.feather'):
+    """Saves the merged dataset as an uncompressed Arrow IPC (Feather) file
+
+    Uncompressed Arrow can be memory-mapped by read_dataset, so readers only page in the
+    columns they ask for."""
+    pa_feather.write_feather(compact_dtypes(data).reset_index(), path, compression='uncompressed')
+
+
+def read_dataset(columns=None, path='data/data_complete.feather', csv_path='data/data_complete.csv'):
+    """Loads the merged dataset, memory-mapping the columnar file when it is available
+
+    columns: columns to read besides 'Date', all columns if None
+    path: Arrow IPC file written by write_columnar
+    csv_path: CSV file used when the columnar file or pyarrow is missing
+
+    Returns: pandas dataframe with a 'Date' column"""
+    usecols = None if columns is None else ['Date', *columns]
+
+    if pa is not None and os.path.exists(path):
+        table = pa_feather.read_table(path, columns=usecols, memory_map=True)
+        return table.to_pandas(split_blocks=True)
+
+    data = pd.read_csv(csv_path, usecols=usecols)
+    data['Date'] = pd.to_datetime(data['Date'], format='%Y-%m-%d')
+    return data
+
+
+def dataset_version(path='data/data_complete.feather', csv_path='data/data_complete.csv'):
+    """Returns a key that changes whenever the ETL rewrites the dataset read by read_dataset"""
+    if pa is None or not os.path.exists(path):
+        path = csv_path
+    stat = os.stat(path)
+    return f'{stat.st_mtime_ns}-{stat.st_size}'
+
+
+def freeze(data):
+    """Returns the dataframe backed by read-only arrays, without copying the values
+
+    Used for datasets that are shared between callers, so that none of them can modify
+    the values the others see."""
+    columns = {}
+    for column, values in data.items():
+        array = values.to_numpy()
+        if array.flags.writeable:
+            array = array.view()
+            array.flags.writeable = False
+        columns[column] = array
+    return pd.DataFrame(columns, index=data.index, copy=False)
+
+
+def column_aggregations(sources=SOURCES):
+    """Returns how every merged column is rolled up, columns not listed use 'mean'"""
+    aggregations = {}
+    for source in sources:
+        aggregations.update(source.get('aggregations', {}))
+    return aggregations
+
+
+def rollup(data, level, aggregations=None):
+    """Resamples the dataset to a coarser resolution with the right aggregation per column
+
+    Periods without any value are forward filled from the previous period.
+
+    data: dataframe with a DatetimeIndex
+    level: pandas frequency, one of ROLLUP_LEVELS
+    aggregations: column -> 'mean', 'sum' or 'last', see column_aggregations
+
+    Returns: resampled dataframe with the columns in their original order"""
+    aggregations = column_aggregations() if aggregations is None else aggregations
+    resampler = data.resample(level)
+
+    groups = {}
+    for column in data.columns:
+        groups.setdefault(aggregations.get(column, 'mean'), []).append(column)
+
+    parts = []
+    for how, columns in groups.items():
+        if how == 'sum':
+            # An empty period is missing, not zero
+            parts.append(resampler[columns].sum(min_count=1))
+        elif how == 'last':
+            parts.append(resampler[columns].last())
+        elif how == 'mean':
+            parts.append(resampler[columns].mean())
+        else:
+            raise ValueError(f"Unknown aggregation '{how}' for columns {columns}")
+
+    return pd.concat(parts, axis=1)[list(data.columns)].ffill()
+
+
+def rollup_path(level, directory='data/rollups'):
+    extension = 'feather' if pa is not None else 'csv'
+    return os.path.join(directory, f'data_{level}.{extension}')
+
+
+def build_rollups(data, directory='data/rollups', aggregations=None):
+    """Writes one precomputed file per resolution in ROLLUP_LEVELS
+
+    Returns: list of the levels written"""
+    os.makedirs(directory, exist_ok=True)
+    step = data.index.to_series().diff().median() if len(data) > 1 else pd.Timedelta(days=1)
+
+    levels = []
+    for level, (_, length) in ROLLUP_LEVELS.items():
+        if length < step:
+            continue
+        rolled = rollup(data, level, aggregations)
+        if pa is not None:
+            write_columnar(rolled, rollup_path(level, directory))
+        else:
+            write_dataset(rolled, rollup_path(level, directory))
+        levels.append(level)
+    return levels
+
+
+def available_rollups(directory='data/rollups'):
+    """Returns the levels of ROLLUP_LEVELS that have a precomputed file"""
+    return [level for level in ROLLUP_LEVELS if os.path.exists(rollup_path(level, directory))]
+
+
+def _schema_hash(source):
+    """Hash of everything in a source's registry entry that changes its rows or columns"""
+    schema = {key: value for key, value in source.items() if key != 'transform'}
+    schema['transform'] = getattr(source.get('transform'), '__name__', None)
+    return hashlib.sha256(json.dumps(schema, sort_keys=True).encode()).hexdigest()
+
+
+def _content_hash(frame):
+    """Hash of the rows of a loaded source, including their dates"""
+    return hashlib.sha256(pd.util.hash_pandas_object(frame, index=True).to_numpy().tobytes()).hexdigest()
+
+
+def _read_manifest(path):
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def _write_manifest(path, frames, sources, output, watermark, rows):
+    """Records the watermark and content hash of every source after a build"""
+    manifest = {
+        'output': {
+            'path': output,
+            'watermark': str(watermark.date()),
+            'rows': int(rows),
+            'size': os.path.getsize(output),
+        },
+        'sources': {
+            source['name']: {
+                'schema': _schema_hash(source),
+                'watermark': str(frame.index.max().date()),
+                'hash': _content_hash(frame),
+            }
+            for frame, source in zip(frames, sources)
+        },
+    }
+    with open(path, 'w') as f:
+        json.dump(manifest, f, indent=4)
+
+
+def _full_rebuild_reason(manifest, frames, sources, output):
+    """Returns why the previous build cannot be extended, or None if only new rows were added"""
+    if manifest is None:
+        return 'no manifest'
+    if not os.path.exists(output) or os.path.getsize(output) != manifest['output']['size']:
+        return 'output file changed'
+    if [source['name'] for source in sources] != list(manifest['sources']):
+        return 'source registry changed'
+
+    out_watermark = pd.Timestamp(manifest['output']['watermark'])
+    for frame, source in zip(frames, sources):
+        previous = manifest['sources'][source['name']]
+        if previous['schema'] != _schema_hash(source):
+            return f"schema of {source['name']} changed"
+
+        watermark = pd.Timestamp(previous['watermark'])
+        if _content_hash(frame[frame.index <= watermark]) != previous['hash']:
+            return f"historical rows of {source['name']} changed"
+
+        # New rows dated inside the built range would change rows that are already written
+        new_dates = frame.index[frame.index > watermark]
+        if len(new_dates) and new_dates.min() <= out_watermark:
+            return f"{source['name']} gained rows inside the built range"
+
+    return None
+
+
+def _update_columnar(data, appended, path, csv_path):
+    """Brings the columnar copy in line with the CSV after a build"""
+    if pa is None:
+        return
+    if appended:
+        if not os.path.exists(path):
+            data = read_dataset(path=path, csv_path=csv_path).set_index('Date')
+        elif len(data):
+            data = pd.concat([read_dataset(path=path).set_index('Date'), data])
+        else:
+            return
+    write_columnar(data, path)
+
+
+def build_incremental(sources=SOURCES, output='data/data_complete.csv', manifest_path='data/manifest.json', full=False,
+                      columnar_output='data/data_complete.feather', rollup_directory='data/rollups', frames=None):
+    """Extends the merged dataset with the rows that are newer than the last build
+
+    A manifest next to the output keeps the watermark (latest date) and a content hash of
+    every source. When a source's rows up to its watermark are unchanged, only the dates
+    after the output's watermark are joined and appended to the output. Any change to
+    historical rows, the registry or the output file triggers a full rebuild.
+
+    full: always rebuild the whole dataset
+    columnar_output: Arrow IPC copy of the output for the app, skipped without pyarrow
+    rollup_directory: where the precomputed resolutions of the output are written
+    frames: the sources already loaded by load_source, in the order of sources, loaded here if None
+
+    Returns: (dataframe of the rows written, dict of rows dropped per source name, reason for a full rebuild or None)"""
+    if frames is None:
+        frames = [load_source(source) for source in sources]
+    manifest = _read_manifest(manifest_path)
+
+    reason = 'requested' if full else _full_rebuild_reason(manifest, frames, sources, output)
+
+    if reason is None:
+        # Only the dates after the last build are joined and appended
+        watermark = pd.Timestamp(manifest['output']['watermark'])
+        data, dropped = join_sources([frame[frame.index > watermark] for frame in frames], sources)
+        data = data.sort_index(kind='stable')
+        write_dataset(data, output, append=True)
+        rows = manifest['output']['rows'] + len(data)
+    else:
+        data, dropped = join_sources(frames, sources)
+        data = data.sort_index(kind='stable')
+        write_dataset(data, output)
+        rows = len(data)
+        watermark = pd.Timestamp(0)
+
+    _update_columnar(data, reason is None, columnar_output, output)
+
+    # The rollups are rebuilt from the whole dataset whenever rows were added
+    if reason is not None or len(data):
+        complete = read_dataset(path=columnar_output, csv_path=output).set_index('Date')
+        build_rollups(complete, rollup_directory, column_aggregations(sources))
+
+    if len(data):
+        watermark = data.index.max()
+    _write_manifest(manifest_path, frames, sources, output, watermark, rows)
+
+    return data, dropped, reason
+
+
+def build_pipeline(sources=SOURCES, output='data/data_complete.csv', manifest_path='data/manifest.json', full=False,
+                   columnar_output='data/data_complete.feather', rollup_directory='data/rollups',
+                   cache_directory=PIPELINE_CACHE_DIRECTORY, max_workers=8):
+    """Returns the build of the merged dataset as a Pipeline
+
+    Every source is a load -> normalize branch, the branches run concurrently and each
+    stage's output is cached under a hash of the source file's content, the registry entry
+    and the code, so only the branches of changed sources are run again. The 'write' stage
+    joins the normalized sources with build_incremental and is never cached, the other
+    arguments are those of build_incremental.
+
+    Returns: Pipeline whose 'write' output is the result of build_incremental"""
+    stages = []
+    for source in sources:
+        stages.append(Stage(f"load_{source['name']}", read_source, args=(source,), files=[source['path']]))
+        stages.append(Stage(f"normalize_{source['name']}", normalize_source, inputs=[f"load_{source['name']}"], args=(source,)))
+
+    write = lambda *frames: build_incremental(sources, output, manifest_path, full, columnar_output, rollup_directory,
+                                                 frames=list(frames))
+    stages.append(Stage('write', write, inputs=[f"normalize_{source['name']}" for source in sources], cache=False))
+
+    return Pipeline(stages, cache_directory, max_workers)
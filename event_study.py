@@ -0,0 +1,84 @@
+import numpy as np
+import pandas as pd
+
+# Protocol upgrades of the Ethereum mainnet, name -> activation date
+EVENTS = {
+    'London': pd.Timestamp('2021-08-05'),
+    'Merge': pd.Timestamp('2022-09-15'),
+    'Shanghai': pd.Timestamp('2023-04-12'),
+    'Dencun': pd.Timestamp('2024-03-13'),
+}
+
+# Lengths in days of the windows compared before and after every event
+WINDOWS = (7, 14, 30, 60, 90)
+
+EVENT_COLUMNS = ['n_pre', 'n_post', 'mean_pre', 'mean_post', 'std_pre', 'std_post', 'mean_change', 't_stat']
+
+
+def _window_sums(cumulative, starts, ends):
+    """Returns the sums of the rows starts[i]:ends[i] of the array the cumulative sums were taken of"""
+    return cumulative[ends] - cumulative[starts]
+
+
+def event_study(data, events=EVENTS, windows=WINDOWS):
+    """Compares every numeric column in symmetric windows before and after every event
+
+    The pre window of an event on day d and a window of w days covers [d - w, d), the
+    post window [d, d + w). Cumulative sums of the values, their squares and the number of
+    present values are taken once; the bounds of all event and window combinations are
+    found with one binary search on the sorted index, so every statistic of the grid is
+    two lookups into the cumulative sums. Missing values are skipped.
+
+    data: dataframe with a sorted DatetimeIndex
+    events: event name -> date
+    windows: window lengths in days
+
+    Returns: dataframe indexed by (event, window, metric) with the columns in EVENT_COLUMNS,
+    mean_change is the change of the mean in % and t_stat Welch's t statistic"""
+    numeric = data.select_dtypes('number')
+    values = numeric.to_numpy(dtype=np.float64)
+    present = ~np.isnan(values)
+
+    # Centering on the column means keeps the sums of squares accurate for large values
+    with np.errstate(invalid='ignore'):
+        center = np.nanmean(values, axis=0) if len(values) else np.zeros(values.shape[1])
+    centered = np.where(present, values - center, 0.0)
+
+    zeros = np.zeros((1, values.shape[1]))
+    count_sums = np.concatenate([zeros, np.cumsum(present, axis=0)])
+    value_sums = np.concatenate([zeros, np.cumsum(centered, axis=0)])
+    square_sums = np.concatenate([zeros, np.cumsum(centered ** 2, axis=0)])
+
+    # Bounds of every (event, window) pair, event major
+    dates = np.array([np.datetime64(pd.Timestamp(date), 'ns') for date in events.values()])
+    lengths = np.array([np.timedelta64(window, 'D') for window in windows]).astype('timedelta64[ns]')
+    index = data.index.to_numpy()
+    starts = index.searchsorted((dates[:, None] - lengths[None, :]).ravel())
+    splits = index.searchsorted(np.repeat(dates, len(windows)))
+    ends = index.searchsorted((dates[:, None] + lengths[None, :]).ravel())
+
+    statistics = {}
+    with np.errstate(invalid='ignore', divide='ignore'):
+        for side, (first, last) in (('pre', (starts, splits)), ('post', (splits, ends))):
+            count = _window_sums(count_sums, first, last)
+            total = _window_sums(value_sums, first, last)
+            squares = _window_sums(square_sums, first, last)
+            mean = total / count
+            variance = (squares - total * mean) / (count - 1)
+            statistics[f'n_{side}'] = count
+            statistics[f'mean_{side}'] = mean + center
+            statistics[f'std_{side}'] = np.sqrt(np.maximum(variance, 0))
+            statistics[f'var_{side}'] = np.where(count > 1, variance, np.nan)
+
+        mean_change = (statistics['mean_post'] - statistics['mean_pre']) / statistics['mean_pre'] * 100
+        t_stat = (statistics['mean_post'] - statistics['mean_pre']) / np.sqrt(statistics['var_pre'] / statistics['n_pre']
+                                                                                + statistics['var_post'] / statistics['n_post'])
+    statistics['std_pre'] = np.where(statistics['n_pre'] > 1, statistics['std_pre'], np.nan)
+    statistics['std_post'] = np.where(statistics['n_post'] > 1, statistics['std_post'], np.nan)
+    statistics['mean_change'] = mean_change
+    statistics['t_stat'] = t_stat
+
+    index = pd.MultiIndex.from_product([list(events), list(windows), list(numeric.columns)], names=['event', 'window', 'metric'])
+    result = pd.DataFrame({column: statistics[column].ravel() for column in EVENT_COLUMNS}, index=index)
+    result[['n_pre', 'n_post']] = result[['n_pre', 'n_post']].astype('int64')
+    return result
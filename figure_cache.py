@@ -0,0 +1,87 @@
+import threading
+from collections import OrderedDict
+
+
+class FigureCache:
+    """Least recently used store of built Plotly figures, bounded by count and size
+
+    Every entry is a figure together with the length of its serialized JSON spec, which
+    is what the cap on memory counts. When either limit is exceeded the least recently
+    shown figures are evicted first. The figures are shared by every caller and must not
+    be modified after they were stored.
+
+    A figure is built once per key even when several sessions ask for it at the same
+    time: the first caller builds it while the others wait for the result."""
+
+    def __init__(self, max_entries=256, max_bytes=64 * 2**20):
+        """max_entries: most figures kept
+        max_bytes: most bytes of serialized specs kept"""
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._building = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def size(self):
+        """Bytes of serialized specs currently kept"""
+        return self._bytes
+
+    def get(self, key):
+        """Returns the figure stored under a key and marks it as recently used, None if there is none"""
+        with self._lock:
+            if key not in self._entries:
+                return None
+            self._entries.move_to_end(key)
+            return self._entries[key][0]
+
+    def put(self, key, fig):
+        """Stores a figure, evicting the least recently used ones beyond the limits
+
+        A figure whose spec alone is larger than max_bytes is not stored."""
+        size = len(fig.to_json())
+        with self._lock:
+            if key in self._entries:
+                self._bytes -= self._entries.pop(key)[1]
+            if size > self.max_bytes:
+                return
+            self._entries[key] = (fig, size)
+            self._bytes += size
+
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._bytes -= evicted
+
+    def get_or_build(self, key, build):
+        """Returns the figure of a key, calling build() to create it if it is not stored
+
+        Returns: (figure, True if it was built by this call)"""
+        fig = self.get(key)
+        if fig is not None:
+            return fig, False
+
+        with self._lock:
+            key_lock = self._building.setdefault(key, threading.Lock())
+
+        with key_lock:
+            # Another caller may have built it while this one was waiting
+            fig = self.get(key)
+            if fig is not None:
+                return fig, False
+            try:
+                fig = build()
+                self.put(key, fig)
+            finally:
+                with self._lock:
+                    self._building.pop(key, None)
+        return fig, True
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
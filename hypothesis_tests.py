@@ -0,0 +1,126 @@
+import os
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+# Number of resamples drawn by one task of the process pool
+RESAMPLES_PER_TASK = 1000
+
+
+def split_periods(data, column, split_date):
+    """Returns the non-missing values of a column before and after split_date"""
+    split = data.index.searchsorted(split_date)
+    values = data[column].to_numpy(dtype=np.float64)
+    before = values[:split]
+    after = values[split:]
+    return before[~np.isnan(before)], after[~np.isnan(after)]
+
+
+def classic_tests(before, after):
+    """Runs the Wilcoxon, Mann-Whitney U, Levene and one-way ANOVA tests on two periods
+
+    The Wilcoxon signed-rank test needs paired samples, so it compares the last n days
+    before the split with the first n days after it, n being the shorter period.
+
+    Returns: dict of p-values"""
+    results = {'wilcoxon_p': np.nan, 'mannwhitney_p': np.nan, 'levene_p': np.nan, 'anova_p': np.nan}
+    if len(before) < 2 or len(after) < 2:
+        return results
+
+    count = min(len(before), len(after))
+    tests = {
+        'wilcoxon_p': lambda: stats.wilcoxon(before[-count:], after[:count]).pvalue,
+        'mannwhitney_p': lambda: stats.mannwhitneyu(before, after).pvalue,
+        'levene_p': lambda: stats.levene(before, after).pvalue,
+        'anova_p': lambda: stats.f_oneway(before, after).pvalue,
+    }
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        for name, test in tests.items():
+            try:
+                results[name] = float(test())
+            except ValueError:
+                # e.g. Wilcoxon on samples whose differences are all zero
+                pass
+    return results
+
+
+def _resample_task(before, after, resamples, seed):
+    """Draws bootstrap and permutation resamples of the two periods
+
+    Returns: (bootstrap mean differences, bootstrap std ratios, permutation mean differences)"""
+    rng = np.random.default_rng(seed)
+
+    # Bootstrap each period independently
+    boot_before = before[rng.integers(0, len(before), size=(resamples, len(before)))]
+    boot_after = after[rng.integers(0, len(after), size=(resamples, len(after)))]
+    mean_differences = boot_after.mean(axis=1) - boot_before.mean(axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        std_ratios = boot_after.std(axis=1, ddof=1) / boot_before.std(axis=1, ddof=1)
+
+    # Shuffle the period labels for the permutation test
+    pooled = np.concatenate([before, after])
+    shuffled = rng.permuted(np.broadcast_to(pooled, (resamples, len(pooled))), axis=1)
+    permuted_differences = shuffled[:, len(before):].mean(axis=1) - shuffled[:, :len(before)].mean(axis=1)
+
+    return mean_differences, std_ratios, permuted_differences
+
+
+def run_tests(data, split_date, columns=None, resamples=5000, confidence=0.95, seed=0, max_workers=None):
+    """Runs every test for every metric of the dataset
+
+    Besides the classic tests, a bootstrap confidence interval for the difference in
+    means (after - before) and the ratio of standard deviations (after / before) and a
+    permutation p-value for the difference in means are computed. The resamples are
+    split into tasks of RESAMPLES_PER_TASK and spread over a process pool.
+
+    data: dataframe with a sorted DatetimeIndex
+    split_date: date separating the periods
+    columns: metrics to test, all numeric columns if None
+    resamples: number of bootstrap and permutation resamples per metric
+    confidence: confidence level of the intervals
+    seed: seed of the random generator, results are reproducible for a given seed
+    max_workers: size of the process pool, defaults to the number of cores
+
+    Returns: dataframe indexed by metric"""
+    columns = list(data.select_dtypes('number').columns if columns is None else columns)
+    periods = {column: split_periods(data, column, split_date) for column in columns}
+    testable = [column for column in columns if min(len(periods[column][0]), len(periods[column][1])) >= 2]
+
+    # One independent random stream per task
+    tasks = []
+    for column in testable:
+        for start in range(0, resamples, RESAMPLES_PER_TASK):
+            tasks.append((column, min(RESAMPLES_PER_TASK, resamples - start)))
+    seeds = np.random.SeedSequence(seed).spawn(len(tasks))
+
+    draws = {column: [] for column in testable}
+    with ProcessPoolExecutor(max_workers=max_workers or os.cpu_count()) as executor:
+        futures = [executor.submit(_resample_task, *periods[column], count, task_seed)
+                   for (column, count), task_seed in zip(tasks, seeds)]
+        for (column, _), future in zip(tasks, futures):
+            draws[column].append(future.result())
+
+    tail = (1 - confidence) / 2 * 100
+    rows = {}
+    for column in columns:
+        before, after = periods[column]
+        row = {'n_before': len(before), 'n_after': len(after), **classic_tests(before, after)}
+
+        row['mean_diff'] = after.mean() - before.mean() if column in draws else np.nan
+        row['std_ratio'] = after.std(ddof=1) / before.std(ddof=1) if column in draws else np.nan
+        row['mean_diff_low'] = row['mean_diff_high'] = np.nan
+        row['std_ratio_low'] = row['std_ratio_high'] = row['permutation_p'] = np.nan
+
+        if column in draws:
+            mean_differences, std_ratios, permuted_differences = (np.concatenate(parts) for parts in zip(*draws[column]))
+            row['mean_diff_low'], row['mean_diff_high'] = np.percentile(mean_differences, [tail, 100 - tail])
+            row['std_ratio_low'], row['std_ratio_high'] = np.nanpercentile(std_ratios, [tail, 100 - tail])
+            extreme = np.sum(np.abs(permuted_differences) >= abs(row['mean_diff']))
+            row['permutation_p'] = (extreme + 1) / (len(permuted_differences) + 1)
+
+        rows[column] = row
+
+    return pd.DataFrame.from_dict(rows, orient='index')
@@ -0,0 +1,111 @@
+import json
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+
+
+class Recorder:
+    """Collects wall times of the app's sections and stages and cache hit/miss counts
+
+    A section is a method of the app; a stage (load, compute, figure, network) is a part of
+    the section running on the same thread. Every timing is kept in a sliding window of the
+    latest `window` samples per section and stage, for the percentiles, and appended as one
+    JSON line to the log file."""
+
+    def __init__(self, log_path=None, window=200):
+        """log_path: JSON lines file the timings are appended to, None to keep them in memory only
+        window: number of latest samples per section and stage used for the percentiles"""
+        self.log_path = log_path
+        self.window = window
+
+        self._samples = defaultdict(lambda: deque(maxlen=window))
+        self._cache_counts = defaultdict(lambda: {'hits': 0, 'misses': 0})
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+        if log_path and os.path.dirname(log_path):
+            os.makedirs(os.path.dirname(log_path), exist_ok=True)
+
+    def _stack(self, name):
+        if not hasattr(self._local, name):
+            setattr(self._local, name, [])
+        return getattr(self._local, name)
+
+    def _record(self, event):
+        with self._lock:
+            self._samples[(event['section'], event['stage'])].append(event['seconds'])
+            if self.log_path:
+                with open(self.log_path, 'a') as f:
+                    f.write(json.dumps(event) + '\n')
+
+    @contextmanager
+    def section(self, name):
+        """Times a section, stages timed inside it are attributed to it"""
+        sections = self._stack('sections')
+        sections.append(name)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            sections.pop()
+            self._record({'time': time.time(), 'section': name, 'stage': 'total', 'seconds': seconds})
+
+    @contextmanager
+    def stage(self, name):
+        """Times a stage of the section running on this thread"""
+        sections = self._stack('sections')
+        section = sections[-1] if sections else None
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            self._record({'time': time.time(), 'section': section, 'stage': name, 'seconds': seconds})
+
+    @contextmanager
+    def cache_lookup(self, cache):
+        """Counts a call of a cached function as a hit unless cache_miss is called inside it"""
+        lookups = self._stack('lookups')
+        lookup = [cache, False]
+        lookups.append(lookup)
+        try:
+            yield
+        finally:
+            lookups.pop()
+            with self._lock:
+                self._cache_counts[cache]['misses' if lookup[1] else 'hits'] += 1
+
+    def cache_miss(self, cache):
+        """Marks the innermost running lookup of a cache as a miss, called from the cached function's body"""
+        for lookup in reversed(self._stack('lookups')):
+            if lookup[0] == cache:
+                lookup[1] = True
+                return
+
+    def timings(self):
+        """Returns count, mean, p50 and p95 in seconds per section and stage over the sliding window"""
+        # Imported here so that recording timings does not load the analytics stack
+        import numpy as np
+        import pandas as pd
+
+        with self._lock:
+            samples = {key: np.array(values) for key, values in self._samples.items()}
+
+        rows = [{'section': section, 'stage': stage, 'count': len(values), 'mean': values.mean(),
+                 'p50': np.percentile(values, 50), 'p95': np.percentile(values, 95)}
+                for (section, stage), values in samples.items()]
+        return pd.DataFrame(rows, columns=['section', 'stage', 'count', 'mean', 'p50', 'p95'])
+
+    def cache_stats(self):
+        """Returns hits, misses and hit rate per cache"""
+        import pandas as pd
+
+        with self._lock:
+            counts = {cache: dict(values) for cache, values in self._cache_counts.items()}
+
+        data = pd.DataFrame.from_dict(counts, orient='index', columns=['hits', 'misses'])
+        data['hit_rate'] = data['hits'] / (data['hits'] + data['misses'])
+        return data
@@ -0,0 +1,146 @@
+import os
+import pandas as pd
+
+from sources import SOURCES, add_average_gas_price
+from etl import pa, load_source, compact_dtypes
+
+if pa is not None:
+    import pyarrow.feather as pa_feather
+
+# Where build_intraday writes one file per network, timeframe and month
+INTRADAY_DIRECTORY = 'data/intraday'
+
+
+def partition_path(network, timeframe, month, directory=INTRADAY_DIRECTORY):
+    """Returns the file holding one month of candles, month being a 'YYYY-MM' string"""
+    extension = 'feather' if pa is not None else 'csv'
+    return os.path.join(directory, f'{network}_{timeframe}m', f'{month}.{extension}')
+
+
+def _months(from_time, to_time):
+    """Returns (label, start, end) of every calendar month overlapping the unix time range, in UTC"""
+    start = pd.Timestamp(from_time, unit='s', tz='UTC')
+    end = pd.Timestamp(to_time, unit='s', tz='UTC')
+
+    months = []
+    for month in pd.period_range(start, end, freq='M'):
+        month_start = max(month.start_time.tz_localize('UTC'), start)
+        month_end = min((month.end_time + pd.Timedelta(1, 'ns')).tz_localize('UTC'), end)
+        months.append((str(month), int(month_start.timestamp()), int(month_end.timestamp())))
+    return months
+
+
+def candles_to_frame(data):
+    """Turns stored candles into a dataframe indexed by candle start, oldest first
+
+    The average of the open, close, low and high gas price is added as
+    'average_gas_price', like for the daily dataset."""
+    data = data.iloc[::-1]
+    dates = pd.to_datetime(data.pop('Timestamp'), format='ISO8601', utc=True).dt.tz_localize(None)
+    data.index = pd.DatetimeIndex(dates, name='Date').as_unit('ns')
+    return add_average_gas_price(data)
+
+
+def _write_partition(data, path):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    if pa is not None:
+        pa_feather.write_feather(compact_dtypes(data).reset_index(), path, compression='uncompressed')
+    else:
+        data.to_csv(path, index_label='Date', date_format='%Y-%m-%d %H:%M:%S')
+
+
+def _read_partition(path, columns=None):
+    usecols = None if columns is None else ['Date', *columns]
+    if pa is not None:
+        data = pa_feather.read_table(path, columns=usecols, memory_map=True).to_pandas()
+    else:
+        data = pd.read_csv(path, usecols=usecols)
+        data['Date'] = pd.to_datetime(data['Date'], format='%Y-%m-%d %H:%M:%S')
+    return data.set_index('Date')
+
+
+def build_intraday(cache, network, from_time, to_time, timeframe=5, directory=INTRADAY_DIRECTORY, full=False):
+    """Writes the intraday gas price candles of a time period as one file per month
+
+    The period is processed one calendar month at a time: the month's missing candles are
+    fetched into the candle cache, read back, given their average gas price and written
+    to their partition. Only one month of candles is held in memory, whatever the length
+    of the period. Months whose partition was written after the month ended are complete
+    and are skipped unless full is set.
+
+    cache: CandleCache fetching and storing the candles
+    network: 'eth' or 'bsc'
+    from_time: unix timestamp
+    to_time: unix timestamp
+    timeframe: timeframe of the candles in minutes
+    directory: root directory of the partitions
+    full: rewrite every partition
+
+    Returns: list of the months written, None if the API did not answer"""
+    written = []
+    for month, start, end in _months(from_time, to_time):
+        path = partition_path(network, timeframe, month, directory)
+        month_end = pd.Period(month, freq='M').end_time.tz_localize('UTC').timestamp()
+        if not full and os.path.exists(path) and os.path.getmtime(path) > month_end:
+            continue
+
+        if not cache.fetch_missing(network, start, end, timeframe):
+            return None
+        data = cache.load(network, start, end, timeframe)
+        if data.empty:
+            continue
+
+        _write_partition(candles_to_frame(data), path)
+        written.append(month)
+
+    return written
+
+
+def join_daily(data, sources=SOURCES):
+    """Adds the daily series of the registered sources to every intraday row
+
+    Every candle gets the values of its calendar day. The join is done per candle, so
+    candles of days missing from a daily source keep empty values instead of being dropped.
+
+    data: intraday dataframe with a DatetimeIndex
+    sources: the source registry, its first entry (the gas price candles) is skipped
+
+    Returns: dataframe with the intraday and the daily columns"""
+    days = data.index.normalize()
+    columns = [data]
+    for source in sources[1:]:
+        frame = load_source(source)
+        frame = frame[~frame.index.duplicated()]
+        columns.append(frame.reindex(days).set_axis(data.index))
+    return pd.concat(columns, axis=1)
+
+
+def read_intraday(network, timeframe, start=None, end=None, columns=None, daily=False, directory=INTRADAY_DIRECTORY):
+    """Loads the partitions covering a date range
+
+    network: 'eth' or 'bsc'
+    timeframe: timeframe of the candles in minutes
+    start: first date to read, from the first partition if None
+    end: last date to read (exclusive), up to the last partition if None
+    columns: candle columns to read, all if None
+    daily: join the daily series of the registered sources at the end
+
+    Returns: pandas dataframe indexed by candle start, oldest first"""
+    folder = os.path.dirname(partition_path(network, timeframe, '', directory))
+    months = sorted(os.path.splitext(name)[0] for name in os.listdir(folder)) if os.path.isdir(folder) else []
+    start = None if start is None else pd.Timestamp(start)
+    end = None if end is None else pd.Timestamp(end)
+
+    parts = []
+    for month in months:
+        period = pd.Period(month, freq='M')
+        if (start is not None and period.end_time < start) or (end is not None and period.start_time >= end):
+            continue
+        part = _read_partition(partition_path(network, timeframe, month, directory), columns)
+        parts.append(part.loc[start:end - pd.Timedelta(1, 'ns') if end is not None else None])
+
+    if not parts:
+        return None
+    data = pd.concat(parts)
+
+    return join_daily(data) if daily else data
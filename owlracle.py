@@ -1,11 +1,24 @@
 import yaml
 import requests
+import numpy as np
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+
+OWLRACLE_BASE_URL = 'https://api.owlracle.info/v4'
+
+# Maximum number of candles the history endpoint returns per request
+MAX_CANDLES_PER_REQUEST = 1000
+
+# Seconds to wait for a single history request before giving up
+REQUEST_TIMEOUT = 30
 
 class OwlracleConnection:
-    def __init__(self, config_file='config.yaml'):
+    def __init__(self, config_file='config.yaml', base_url=OWLRACLE_BASE_URL, max_workers=8):
         self.config = self._load_config(config_file)
         self.api_key = self._load_api_key()
+        self.base_url = base_url
+        self.max_workers = max_workers
+        self.session = self._create_session()
 
     def _load_config(self, config_file):
         try:
@@ -17,12 +30,63 @@ class OwlracleConnection:
             return None
     
     def _load_api_key(self):
+        if self.config is None:
+            return None
         api_key = self.config.get("keys", {}).get("owlracle_api")
         if api_key:
             return api_key
         else:
             print("Error: Owlracle API key not found in config")
             return None
+
+    def _create_session(self):
+        """Creates a keep-alive session whose connection pool fits the concurrency limit"""
+        session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=self.max_workers)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
+
+    def _history_url(self, network, from_time, to_time, candles, timeframe):
+        return '{}/{}/history?from={}&to={}&candles={}&apikey={}&timeframe={}'.format(self.base_url, network, from_time, to_time, candles, self.api_key, timeframe)
+
+    def _fetch_candles(self, network, from_time, to_time, candles, timeframe):
+        """Fetches the raw history JSON for one time window, raising on HTTP errors"""
+        res = self.session.get(self._history_url(network, from_time, to_time, candles, timeframe), timeout=REQUEST_TIMEOUT)
+        res.raise_for_status()
+        return res.json()
+
+    def fetch_candles(self, network, from_time, to_time, timeframe=1440, candles=MAX_CANDLES_PER_REQUEST):
+        """Fetches the candles of one time window with a single request
+
+        Unlike get_average_gas_price errors are raised instead of printed, so callers
+        can retry them.
+
+        network: 'eth' or 'bsc'
+        from_time: unix timestamp
+        to_time: unix timestamp
+        timeframe: timeframe of the candles in minutes
+        candles: maximum number of candles returned
+
+        Returns: pandas dataframe ordered like the API (newest candle first)
+
+        Raises: requests.RequestException on connection and HTTP errors, ValueError or
+        KeyError on a malformed response"""
+        return self.flatten_json_data(self._fetch_candles(network, from_time, to_time, candles, timeframe))
+
+    def _split_time_range(self, from_time, to_time, timeframe, candles):
+        """Splits from_time..to_time into consecutive windows holding at most `candles` candles each
+
+        The API includes both ends of a window, and neighbouring windows share their boundary,
+        so a window spans candles - 1 steps."""
+        window = max(candles - 1, 1) * timeframe * 60
+        windows = []
+        start = from_time
+        while start < to_time:
+            end = min(start + window, to_time)
+            windows.append((start, end))
+            start = end
+        return windows
         
     def get_average_gas_price(self, network, from_time, to_time, candles=100, timeframe=1440):
         """Returns the average gas price for a given network and time period
@@ -40,37 +104,74 @@ class OwlracleConnection:
             print("Error: Owlracle API key not loaded")
             return None
         
-        url = 'https://api.owlracle.info/v4/{}/history?from={}&to={}&candles={}&apikey={}&timeframe={}'.format(network, from_time, to_time, candles, self.api_key, timeframe)
         try:
-            res = requests.get(url)
-            data = res.json()
+            data = self._fetch_candles(network, from_time, to_time, candles, timeframe)
             data = self.flatten_json_data(data)
             return data
-        except:
-            print("Error: Connection to the Owlracle API failed")
+        except (requests.RequestException, ValueError, KeyError) as e:
+            print(f"Error: Connection to the Owlracle API failed ({e})")
             return None
 
+    def get_gas_price_history(self, network, from_time, to_time, timeframe=1440, candles=MAX_CANDLES_PER_REQUEST, max_workers=None):
+        """Returns the gas price history for a long time period by fetching it in windows
+
+        The range is split into windows of at most `candles` candles which are fetched
+        concurrently over the pooled session and stitched back together.
+
+        network: 'eth' or 'bsc'
+        from_time: unix timestamp
+        to_time: unix timestamp
+        timeframe: timeframe of the candles in minutes
+        candles: maximum number of candles per request
+        max_workers: number of concurrent requests, defaults to the connection's limit
+
+        Returns: pandas dataframe ordered like the API (newest candle first)"""
+        if self.api_key is None:
+            print("Error: Owlracle API key not loaded")
+            return None
+
+        windows = self._split_time_range(from_time, to_time, timeframe, candles)
+        if not windows:
+            return self.flatten_json_data({'candles': []})
+
+        def fetch_window(window):
+            return self.flatten_json_data(self._fetch_candles(network, window[0], window[1], candles, timeframe))
+
+        try:
+            with ThreadPoolExecutor(max_workers=max_workers or self.max_workers) as executor:
+                frames = list(executor.map(fetch_window, windows))
+        except (requests.RequestException, ValueError, KeyError) as e:
+            print(f"Error: Connection to the Owlracle API failed ({e})")
+            return None
+
+        # Neighbouring windows share their boundary, so the same candle can come back twice
+        data = pd.concat(frames, ignore_index=True)
+        data = data.drop_duplicates(subset='Timestamp')
+        data = data.sort_values('Timestamp', ascending=False, ignore_index=True)
+        return data
+
     def flatten_json_data(self, json_data):
-        """Flattes the JSON data and returns a pandas dataframe"""
+        """Flattes the JSON data and returns a pandas dataframe
+
+        The nested candle fields are written column by column into typed NumPy arrays
+        and the timestamps are parsed once into a datetime64 column (UTC)."""
 
-        flat_data = []
+        candles = json_data['candles']
+        count = len(candles)
 
-        print(json_data)
+        gas_prices = [candle['gasPrice'] for candle in candles]
 
-        for candle in json_data['candles']:
-            flat_candle = {
-                'Timestamp': candle['timestamp'],
-                'GasPriceOpen': candle['gasPrice']['open'],
-                'GasPriceClose': candle['gasPrice']['close'],
-                'GasPriceLow': candle['gasPrice']['low'],
-                'GasPriceHigh': candle['gasPrice']['high'],
-                'avgGas': candle['avgGas'],
-                'Samples': candle['samples']
-            }
-            flat_data.append(flat_candle)
+        columns = {
+            'Timestamp': pd.to_datetime([candle['timestamp'] for candle in candles], format='ISO8601', utc=True),
+            'GasPriceOpen': np.fromiter((gas_price['open'] for gas_price in gas_prices), dtype=np.float64, count=count),
+            'GasPriceClose': np.fromiter((gas_price['close'] for gas_price in gas_prices), dtype=np.float64, count=count),
+            'GasPriceLow': np.fromiter((gas_price['low'] for gas_price in gas_prices), dtype=np.float64, count=count),
+            'GasPriceHigh': np.fromiter((gas_price['high'] for gas_price in gas_prices), dtype=np.float64, count=count),
+            'avgGas': np.fromiter((candle['avgGas'] for candle in candles), dtype=np.float64, count=count),
+            'Samples': np.fromiter((candle['samples'] for candle in candles), dtype=np.int64, count=count),
+        }
 
         # Create the pandas DataFrame
-        df = pd.DataFrame(flat_data)
+        df = pd.DataFrame(columns)
 
         return df
-    
\ No newline at end of file
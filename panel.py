@@ -0,0 +1,157 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pandas as pd
+
+from sources import SOURCES, NETWORKS
+from etl import pa, load_source, compact_dtypes, column_aggregations
+
+if pa is not None:
+    import pyarrow.feather as pa_feather
+
+# Gas prices of every network, one row per (network, date)
+PANEL_PATH = 'data/panel.feather'
+PANEL_CSV_PATH = 'data/panel.csv'
+
+
+def fetch_networks(cache, from_time, to_time, networks=None, timeframe=1440, max_workers=None):
+    """Fetches the gas price candles of several networks concurrently
+
+    Every network's candles are written to its file in sources.NETWORKS. A network the
+    API does not answer for keeps its previous file.
+
+    cache: CandleCache fetching and storing the candles
+    from_time: unix timestamp
+    to_time: unix timestamp
+    networks: networks to fetch, all of NETWORKS if None
+    max_workers: number of networks fetched at the same time, all of them by default
+
+    Returns: list of the networks that were fetched"""
+    networks = list(NETWORKS if networks is None else networks)
+
+    def fetch(network):
+        data = cache.get_average_gas_price(network, from_time, to_time, timeframe)
+        if data is None or data.empty:
+            return False
+        data.to_csv(NETWORKS[network][1], index=False)
+        return True
+
+    with ThreadPoolExecutor(max_workers=max_workers or len(networks)) as executor:
+        fetched = list(executor.map(fetch, networks))
+
+    return [network for network, ok in zip(networks, fetched) if ok]
+
+
+def load_network(network, source=SOURCES[0]):
+    """Loads the gas price file of a network like the gas price source of the registry"""
+    return load_source(source, NETWORKS[network][1])
+
+
+def build_panel(networks=None, source=SOURCES[0], max_workers=None):
+    """Loads the gas prices of every network with a file into one panel
+
+    The networks are parsed in parallel and stacked, the network is stored as a category.
+
+    Returns: dataframe indexed by (network, Date), sorted"""
+    networks = [network for network in (NETWORKS if networks is None else networks) if os.path.exists(NETWORKS[network][1])]
+    if not networks:
+        return None
+
+    with ThreadPoolExecutor(max_workers=max_workers or len(networks)) as executor:
+        frames = list(executor.map(lambda network: load_network(network, source), networks))
+
+    panel = pd.concat(frames, keys=pd.CategoricalIndex(networks, categories=list(NETWORKS)), names=['network', 'Date'])
+    return panel.sort_index(kind='stable')
+
+
+def write_panel(panel, path=PANEL_PATH, csv_path=PANEL_CSV_PATH):
+    """Saves the panel as an uncompressed Arrow IPC file, the network as a dictionary column
+
+    The CSV is written instead when pyarrow is not installed."""
+    if pa is not None:
+        pa_feather.write_feather(compact_dtypes(panel.reset_index('network')).reset_index(), path, compression='uncompressed')
+    else:
+        panel.to_csv(csv_path, date_format='%Y-%m-%d')
+
+
+def read_panel(columns=None, networks=None, path=PANEL_PATH, csv_path=PANEL_CSV_PATH):
+    """Loads the panel, memory-mapping the columnar file when it is available
+
+    columns: columns to read besides the network and date, all if None
+    networks: networks to keep, all if None
+
+    Returns: dataframe indexed by (network, Date)"""
+    usecols = None if columns is None else ['network', 'Date', *columns]
+    if pa is not None and os.path.exists(path):
+        panel = pa_feather.read_table(path, columns=usecols, memory_map=True).to_pandas()
+    else:
+        panel = pd.read_csv(csv_path, usecols=usecols)
+        panel['Date'] = pd.to_datetime(panel['Date'], format='%Y-%m-%d')
+    panel['network'] = panel['network'].astype(pd.CategoricalDtype(list(NETWORKS)))
+    panel = panel.set_index(['network', 'Date'])
+
+    if networks is not None:
+        panel = panel[panel.index.get_level_values('network').isin(networks)]
+    return panel
+
+
+def panel_networks(path=PANEL_PATH, csv_path=PANEL_CSV_PATH):
+    """Returns the networks stored in the panel, in the order of sources.NETWORKS"""
+    if (pa is None or not os.path.exists(path)) and not os.path.exists(csv_path):
+        return []
+    present = set(read_panel([], path=path, csv_path=csv_path).index.get_level_values('network'))
+    return [network for network in NETWORKS if network in present]
+
+
+def rollup_panel(panel, level, aggregations=None):
+    """Resamples every network of the panel to a coarser resolution in one grouped pass
+
+    Every column uses the same aggregation as in etl.rollup. Empty periods between a
+    network's first and last row are added and forward filled within the network.
+
+    Returns: dataframe indexed by (network, Date)"""
+    aggregations = column_aggregations() if aggregations is None else aggregations
+    grouped = panel.groupby([panel.index.get_level_values('network'), pd.Grouper(level='Date', freq=level)], observed=True)
+
+    groups = {}
+    for column in panel.columns:
+        groups.setdefault(aggregations.get(column, 'mean'), []).append(column)
+
+    parts = []
+    for how, columns in groups.items():
+        if how == 'sum':
+            # An empty period is missing, not zero
+            parts.append(grouped[columns].sum(min_count=1))
+        elif how == 'last':
+            parts.append(grouped[columns].last())
+        elif how == 'mean':
+            parts.append(grouped[columns].mean())
+        else:
+            raise ValueError(f"Unknown aggregation '{how}' for columns {columns}")
+    rolled = pd.concat(parts, axis=1)[list(panel.columns)]
+
+    # The grouping skips empty periods, add them back like resample does
+    dates = rolled.index.get_level_values('Date')
+    networks, periods = [], []
+    for network, positions in rolled.groupby(level='network', observed=True).indices.items():
+        span = pd.date_range(dates[positions].min(), dates[positions].max(), freq=level)
+        networks.append(np.repeat(network, len(span)))
+        periods.append(span)
+    index = pd.MultiIndex.from_arrays([pd.Categorical(np.concatenate(networks), categories=panel.index.levels[0].categories),
+                                       pd.DatetimeIndex(np.concatenate(periods))], names=['network', 'Date'])
+
+    return rolled.reindex(index).groupby(level='network', observed=True).ffill()
+
+
+def panel_summary(panel, split_date, column='average_gas_price'):
+    """Compares a column across networks before and after a date with grouped operations
+
+    Returns: dataframe indexed by network with the mean and std before and after and the
+    change of the mean in %"""
+    period = np.where(panel.index.get_level_values('Date') < split_date, 'before', 'after')
+    stats = panel[column].groupby([panel.index.get_level_values('network'), period], observed=True).agg(['mean', 'std'])
+    stats = stats.unstack()
+    stats.columns = [f'{stat}_{side}' for stat, side in stats.columns]
+    summary = stats.reindex(columns=['mean_before', 'mean_after', 'std_before', 'std_after'])
+    summary['mean_change'] = (summary['mean_after'] - summary['mean_before']) / summary['mean_before'] * 100
+    return summary
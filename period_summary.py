@@ -0,0 +1,63 @@
+import numpy as np
+import pandas as pd
+
+SUMMARY_COLUMNS = ['mean_before', 'mean_after', 'std_before', 'std_after', 'first_before', 'last_before',
+                   'first_after', 'last_after', 'growth_before', 'growth_after']
+
+
+def _side_statistics(values):
+    """Returns mean, std, first, last and growth (%) of every column of a 2D array
+
+    NaN values are skipped for the mean and std like pandas does, first and last are
+    the first and last row like Series.iloc[0] and Series.iloc[-1]."""
+    columns = values.shape[1]
+    if len(values) == 0:
+        empty = np.full(columns, np.nan)
+        return empty, empty, empty, empty, empty
+
+    present = ~np.isnan(values)
+    count = present.sum(axis=0)
+    filled = np.where(present, values, 0.0)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = filled.sum(axis=0) / count
+        squares = np.where(present, values - mean, 0.0) ** 2
+        std = np.sqrt(squares.sum(axis=0) / (count - 1))
+        std[count < 2] = np.nan
+
+        first = values[0]
+        last = values[-1]
+        growth = (last - first) / first * 100
+
+    return mean, std, first, last, growth
+
+
+def period_summary(data, split_date):
+    """Summarises every numeric column before and after a date in one pass
+
+    The rows are split with a binary search on the sorted DatetimeIndex, rows before
+    split_date are 'before', the rest 'after'.
+
+    data: dataframe with a sorted DatetimeIndex
+    split_date: date separating the two periods
+
+    Returns: dataframe indexed by column name with the columns in SUMMARY_COLUMNS"""
+    numeric = data.select_dtypes('number')
+    values = numeric.to_numpy(dtype=np.float64)
+    split = data.index.searchsorted(split_date)
+
+    mean_before, std_before, first_before, last_before, growth_before = _side_statistics(values[:split])
+    mean_after, std_after, first_after, last_after, growth_after = _side_statistics(values[split:])
+
+    return pd.DataFrame({
+        'mean_before': mean_before,
+        'mean_after': mean_after,
+        'std_before': std_before,
+        'std_after': std_after,
+        'first_before': first_before,
+        'last_before': last_before,
+        'first_after': first_after,
+        'last_after': last_after,
+        'growth_before': growth_before,
+        'growth_after': growth_after,
+    }, index=numeric.columns)
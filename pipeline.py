@@ -0,0 +1,189 @@
+import hashlib
+import inspect
+import json
+import os
+import pickle
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+# Where Pipeline keeps the outputs of the cached stages
+PIPELINE_CACHE_DIRECTORY = 'data/pipeline'
+
+
+def _file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def code_version(func):
+    """Returns a hash of the module that defines a function
+
+    The whole module is hashed rather than the function alone, so a change to any helper
+    the function calls also changes the version."""
+    path = inspect.getsourcefile(func)
+    return _file_hash(path) if path else getattr(func, '__qualname__', repr(func))
+
+
+def _describe(value):
+    """Turns the arguments of a stage into JSON for its key, functions by name and code version"""
+    if callable(value):
+        return f'{value.__module__}.{value.__qualname__}:{code_version(value)}'
+    return repr(value)
+
+
+class Stage:
+    """One step of a Pipeline
+
+    The stage calls func with the outputs of its input stages followed by args. Its key is a
+    hash of its name, the code version of func, args, the content of the files it reads and
+    the keys of its inputs, so the key changes whenever anything the output depends on does."""
+
+    def __init__(self, name, func, inputs=(), args=(), files=(), cache=True):
+        """name: unique name of the stage
+        func: function computing the output
+        inputs: names of the stages whose outputs are passed to func, in order
+        args: further arguments of func, they must be JSON or repr serializable
+        files: paths read by func, their content is part of the key
+        cache: store the output on disk, False for stages that write files or must always run"""
+        self.name = name
+        self.func = func
+        self.inputs = list(inputs)
+        self.args = tuple(args)
+        self.files = list(files)
+        self.cache = cache
+
+
+class Pipeline:
+    """Runs a DAG of stages concurrently, reusing the outputs of the stages whose inputs did not change
+
+    Stages run on a thread pool as soon as their inputs are ready, so independent branches
+    overlap and the run takes as long as its slowest branch. The output of every cached stage
+    is pickled to disk under its key. A stage whose key is on disk is loaded instead of run,
+    and the stages feeding only into it are not run at all."""
+
+    def __init__(self, stages, cache_directory=PIPELINE_CACHE_DIRECTORY, max_workers=8):
+        """stages: list of Stage, in any order
+        cache_directory: where the outputs of the cached stages are kept
+        max_workers: number of stages running at the same time"""
+        self.stages = {stage.name: stage for stage in stages}
+        self.cache_directory = cache_directory
+        self.max_workers = max_workers
+        self.order = self._topological_order()
+
+    def _topological_order(self):
+        order = []
+        state = {}
+
+        def visit(name, path):
+            if state.get(name) == 'done':
+                return
+            if state.get(name) == 'visiting':
+                raise ValueError(f"Pipeline has a cycle: {' -> '.join(path + [name])}")
+            if name not in self.stages:
+                raise ValueError(f"Unknown input stage '{name}' of '{path[-1]}'")
+            state[name] = 'visiting'
+            for input_name in self.stages[name].inputs:
+                visit(input_name, path + [name])
+            state[name] = 'done'
+            order.append(name)
+
+        for name in self.stages:
+            visit(name, [])
+        return order
+
+    def keys(self):
+        """Returns the key of every stage, computed from the inputs without running anything"""
+        keys = {}
+        for name in self.order:
+            stage = self.stages[name]
+            description = {
+                'name': name,
+                'code': code_version(stage.func),
+                'args': json.dumps(stage.args, default=_describe, sort_keys=True),
+                'files': [_file_hash(path) for path in stage.files],
+                'inputs': [keys[input_name] for input_name in stage.inputs],
+            }
+            keys[name] = hashlib.sha256(json.dumps(description, sort_keys=True).encode()).hexdigest()
+        return keys
+
+    def _cache_path(self, name, key):
+        return os.path.join(self.cache_directory, f'{name}-{key[:16]}.pkl')
+
+    def _load(self, name, key):
+        with open(self._cache_path(name, key), 'rb') as f:
+            return pickle.load(f)
+
+    def _store(self, name, key, output):
+        """Pickles an output under its key and removes the outputs of older keys of the stage"""
+        os.makedirs(self.cache_directory, exist_ok=True)
+        path = self._cache_path(name, key)
+        temporary_path = path + '.tmp'
+        with open(temporary_path, 'wb') as f:
+            pickle.dump(output, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporary_path, path)
+
+        for file_name in os.listdir(self.cache_directory):
+            if file_name.startswith(f'{name}-') and file_name.endswith('.pkl') and file_name != os.path.basename(path):
+                os.remove(os.path.join(self.cache_directory, file_name))
+
+    def _needed(self, targets, hits):
+        """Returns the stages whose output has to be produced, by a run or from the cache"""
+        needed = set(targets)
+        for name in reversed(self.order):
+            stage = self.stages[name]
+            # A stage that is run needs the outputs of all its inputs, a cached one needs none
+            if name in needed and name not in hits:
+                needed.update(stage.inputs)
+        return needed
+
+    def run(self, targets=None):
+        """Runs the stages needed for the targets
+
+        targets: names of the stages whose outputs are returned, defaults to the stages no other stage reads
+
+        Returns: (dict of target -> output, list of (stage, seconds, 'run' or 'cached') in the order they finished)"""
+        if targets is None:
+            consumed = {input_name for stage in self.stages.values() for input_name in stage.inputs}
+            targets = [name for name in self.order if name not in consumed]
+
+        keys = self.keys()
+        hits = {name for name in self.order
+                if self.stages[name].cache and os.path.exists(self._cache_path(name, keys[name]))}
+        needed = self._needed(targets, hits)
+
+        outputs = {}
+        report = []
+
+        def execute(name):
+            start = time.perf_counter()
+            stage = self.stages[name]
+            if name in hits:
+                return self._load(name, keys[name]), time.perf_counter() - start
+            output = stage.func(*[outputs[input_name] for input_name in stage.inputs], *stage.args)
+            if stage.cache:
+                self._store(name, keys[name], output)
+            return output, time.perf_counter() - start
+
+        # A stage is ready once its inputs are produced, cached stages are ready at once
+        waiting = {name: set() if name in hits else set(self.stages[name].inputs)
+                   for name in self.order if name in needed}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            running = {}
+            while waiting or running:
+                for name in [name for name, inputs in waiting.items() if not inputs]:
+                    del waiting[name]
+                    running[executor.submit(execute, name)] = name
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    outputs[name], seconds = future.result()
+                    report.append((name, seconds, 'cached' if name in hits else 'run'))
+                    for inputs in waiting.values():
+                        inputs.discard(name)
+
+        return {name: outputs[name] for name in targets}, report
@@ -0,0 +1,39 @@
+import threading
+import time
+
+
+class TokenBucket:
+    """Thread-safe token bucket limiting the rate of requests shared by several workers
+
+    The bucket holds up to `capacity` tokens and gains `rate` tokens per second. Every
+    request takes one token, waiting until one is available, so bursts of up to
+    `capacity` requests go out at once and the long-run rate never exceeds `rate`."""
+
+    def __init__(self, rate, capacity=None):
+        """rate: tokens added per second
+        capacity: most tokens held at once, defaults to one second worth of tokens"""
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, tokens=1):
+        """Takes tokens from the bucket, sleeping until enough are available
+
+        Returns: seconds spent waiting"""
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return waited
+                delay = (tokens - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
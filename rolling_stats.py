@@ -0,0 +1,214 @@
+import json
+import math
+import os
+from collections import deque
+import pandas as pd
+
+# Where update_rolling keeps the state and the output of every series
+ROLLING_DIRECTORY = 'data/rolling'
+
+ROLLING_COLUMNS = ['value', 'mean', 'std', 'ewma', 'ewm_std', 'min', 'max', 'changepoint']
+
+
+class RollingStats:
+    """Rolling statistics over the latest `window` values, updated in O(1) per value
+
+    The mean and variance of the window are kept with Welford's update when a value
+    enters and its inverse when a value leaves. The minimum and maximum use monotonic
+    deques, the exponentially weighted mean and variance need no window at all. A two
+    sided CUSUM on the deviation from the weighted mean flags changepoints.
+
+    The whole state can be saved and loaded, so a series is never processed twice."""
+
+    def __init__(self, window=30, span=30, drift=0.5, threshold=5.0):
+        """window: number of values in the rolling window
+        span: span of the exponentially weighted mean, like pandas' ewm(span=...)
+        drift: deviation in standard deviations tolerated by the CUSUM before it grows
+        threshold: CUSUM value that flags a changepoint, None to disable the flags"""
+        self.window = window
+        self.span = span
+        self.alpha = 2 / (span + 1)
+        self.drift = drift
+        self.threshold = threshold
+
+        self.values = deque()
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.minima = deque()
+        self.maxima = deque()
+        self.position = 0
+
+        self.ewma = None
+        self.ewm_var = 0.0
+        self.cusum_high = 0.0
+        self.cusum_low = 0.0
+        self.last_time = None
+
+    def _add(self, value):
+        self.values.append(value)
+        delta = value - self.mean
+        self.mean += delta / len(self.values)
+        self.m2 += delta * (value - self.mean)
+
+        # Monotonic deques of (position, value), the front is the window's minimum / maximum
+        while self.minima and self.minima[-1][1] >= value:
+            self.minima.pop()
+        self.minima.append((self.position, value))
+        while self.maxima and self.maxima[-1][1] <= value:
+            self.maxima.pop()
+        self.maxima.append((self.position, value))
+        self.position += 1
+
+    def _remove_oldest(self):
+        value = self.values.popleft()
+        if not self.values:
+            self.mean = self.m2 = 0.0
+        else:
+            delta = value - self.mean
+            self.mean -= delta / len(self.values)
+            self.m2 = max(self.m2 - delta * (value - self.mean), 0.0)
+
+        oldest = self.position - len(self.values)
+        while self.minima and self.minima[0][0] < oldest:
+            self.minima.popleft()
+        while self.maxima and self.maxima[0][0] < oldest:
+            self.maxima.popleft()
+
+    def _changepoint(self, value):
+        """Updates the CUSUM with the value's deviation from the weighted mean before it"""
+        if self.threshold is None or self.ewma is None or self.ewm_var <= 0:
+            return False
+        deviation = (value - self.ewma) / math.sqrt(self.ewm_var)
+        self.cusum_high = max(0.0, self.cusum_high + deviation - self.drift)
+        self.cusum_low = max(0.0, self.cusum_low - deviation - self.drift)
+        if self.cusum_high > self.threshold or self.cusum_low > self.threshold:
+            self.cusum_high = self.cusum_low = 0.0
+            return True
+        return False
+
+    def update(self, value, time=None):
+        """Adds a value and returns the statistics after it as a dict of ROLLING_COLUMNS"""
+        changepoint = self._changepoint(value)
+
+        self._add(value)
+        if len(self.values) > self.window:
+            self._remove_oldest()
+
+        if self.ewma is None:
+            self.ewma = value
+        else:
+            delta = value - self.ewma
+            self.ewma += self.alpha * delta
+            self.ewm_var = (1 - self.alpha) * (self.ewm_var + self.alpha * delta * delta)
+
+        if time is not None:
+            self.last_time = time
+
+        count = len(self.values)
+        return {
+            'value': value,
+            'mean': self.mean,
+            'std': math.sqrt(self.m2 / (count - 1)) if count > 1 else math.nan,
+            'ewma': self.ewma,
+            'ewm_std': math.sqrt(self.ewm_var),
+            'min': self.minima[0][1],
+            'max': self.maxima[0][1],
+            'changepoint': changepoint,
+        }
+
+    def update_series(self, series):
+        """Feeds the values of a series that are newer than the last value fed
+
+        series: pandas series with a DatetimeIndex, missing values are skipped
+
+        Returns: dataframe with one row of ROLLING_COLUMNS per new value, oldest first"""
+        series = series.sort_index(kind='stable')
+        if self.last_time is not None:
+            series = series[series.index > self.last_time]
+        series = series.dropna()
+
+        rows = [self.update(float(value), time) for time, value in series.items()]
+        return pd.DataFrame(rows, index=series.index, columns=ROLLING_COLUMNS)
+
+    def to_dict(self):
+        state = {key: value for key, value in vars(self).items() if key not in ('values', 'minima', 'maxima', 'last_time')}
+        state['values'] = list(self.values)
+        state['minima'] = [list(item) for item in self.minima]
+        state['maxima'] = [list(item) for item in self.maxima]
+        state['last_time'] = None if self.last_time is None else self.last_time.isoformat()
+        return state
+
+    @classmethod
+    def from_dict(cls, state):
+        stats = cls(state['window'], state['span'], state['drift'], state['threshold'])
+        for key, value in state.items():
+            setattr(stats, key, value)
+        stats.values = deque(state['values'])
+        stats.minima = deque(tuple(item) for item in state['minima'])
+        stats.maxima = deque(tuple(item) for item in state['maxima'])
+        stats.last_time = None if state['last_time'] is None else pd.Timestamp(state['last_time'])
+        return stats
+
+    def save(self, path):
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f)
+
+    @classmethod
+    def load(cls, path):
+        """Returns the saved statistics, None if there is no saved state"""
+        if not os.path.exists(path):
+            return None
+        with open(path, 'r') as f:
+            return cls.from_dict(json.load(f))
+
+
+def rolling_paths(network, timeframe, directory=ROLLING_DIRECTORY):
+    """Returns the (state, output) files of a network's candles of a timeframe in minutes"""
+    name = f'{network}_{timeframe}m'
+    return os.path.join(directory, f'{name}.json'), os.path.join(directory, f'{name}.csv')
+
+
+def last_update(network, timeframe, directory=ROLLING_DIRECTORY):
+    """Returns the time of the last value processed for a series, None if it was never updated"""
+    stats = RollingStats.load(rolling_paths(network, timeframe, directory)[0])
+    return None if stats is None else stats.last_time
+
+
+def update_rolling(series, network, timeframe=1440, window=30, span=30, directory=ROLLING_DIRECTORY, full=False):
+    """Feeds the new values of a series to its saved rolling statistics
+
+    Only the values newer than the last run are processed, their statistics are appended
+    to the output file and the state is saved again.
+
+    series: values with a sorted DatetimeIndex, e.g. the average gas price of the candles
+    network: network of the candles
+    timeframe: timeframe of the candles in minutes
+    window: number of candles in the rolling window of a new state
+    span: span of the weighted mean of a new state
+    full: drop the saved state and output and process the whole series
+
+    Returns: dataframe of the rows appended to the output"""
+    os.makedirs(directory, exist_ok=True)
+    state_path, output_path = rolling_paths(network, timeframe, directory)
+
+    stats = None if full else RollingStats.load(state_path)
+    if stats is None or not os.path.exists(output_path):
+        stats = RollingStats(window, span)
+        if os.path.exists(output_path):
+            os.remove(output_path)
+
+    rows = stats.update_series(series)
+    rows.to_csv(output_path, mode='a', header=not os.path.exists(output_path), index_label='Date')
+    stats.save(state_path)
+
+    return rows
+
+
+def read_rolling(network, timeframe=1440, directory=ROLLING_DIRECTORY):
+    """Returns the rolling statistics written by update_rolling, None if there are none"""
+    output_path = rolling_paths(network, timeframe, directory)[1]
+    if not os.path.exists(output_path):
+        return None
+    data = pd.read_csv(output_path)
+    data['Date'] = pd.to_datetime(data['Date'])
+    return data.set_index('Date')
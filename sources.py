@@ -0,0 +1,90 @@
+# Registry of the data sources merged into data/data_complete.csv
+#
+# Every source lists the file to read, the column holding its date and either the exact
+# format of that date or the unit of its unix timestamp, the dtype of every column that is
+# kept (all other columns are never parsed), the renames and how it is joined onto the
+# base source.
+# The first source is the base: its rows define the rows of the merged dataset.
+# 'inner' sources drop the dates they do not have, 'left' sources leave them empty.
+# 'aggregations' tells how a column is rolled up to coarser resolutions: 'sum' for daily
+# totals, 'last' for cumulative counts and 'mean' (the default) for everything else.
+
+GAS_PRICE_COLUMNS = ['GasPriceOpen', 'GasPriceClose', 'GasPriceLow', 'GasPriceHigh']
+
+# Networks whose gas price candles are fetched from Owlracle: network -> (label, file)
+# Every file has the format of the 'gas_data' source, the Ethereum one is that source's file
+NETWORKS = {
+    'eth': ('Ethereum', 'data/data_owlracle.csv'),
+    'bsc': ('BNB Smart Chain', 'data/data_owlracle_bsc.csv'),
+}
+
+
+def add_average_gas_price(data):
+    """Calculates the average gas price as a new column from the 4 columns that contain the gas price"""
+    data['average_gas_price'] = data[GAS_PRICE_COLUMNS].mean(axis=1)
+    return data
+
+
+SOURCES = [
+    {
+        # Owlracle gas price candles - https://owlracle.info/docs
+        'name': 'gas_data',
+        'path': 'data/data_owlracle.csv',
+        'date_column': 'Timestamp',
+        'date_format': 'ISO8601',
+        'dtypes': {'GasPriceOpen': 'float64', 'GasPriceClose': 'float64', 'GasPriceLow': 'float64', 'GasPriceHigh': 'float64', 'avgGas': 'float64', 'Samples': 'int64'},
+        'rename': {},
+        'aggregations': {'Samples': 'sum'},
+        'how': 'base',
+        'transform': add_average_gas_price,
+    },
+    {
+        # Trading volume data - USD - https://www.kaggle.com/datasets/kapturovalexander/bitcoin-and-ethereum-prices-from-start-to-2023?select=Ethereum+prices.csv
+        'name': 'trading_volume',
+        'path': 'data/pricesdata.csv',
+        'date_column': 'Date',
+        'date_format': '%Y-%m-%d',
+        'dtypes': {'Open': 'float64', 'High': 'float64', 'Low': 'float64', 'Close': 'float64', 'Adj Close': 'float64', 'Volume': 'int64'},
+        'rename': {'Open': 'EthPriceOpenUSD', 'High': 'EthPriceHighUSD', 'Low': 'EthPriceLowUSD', 'Close': 'EthPriceCloseUSD', 'Adj Close': 'EthPriceAdjustedCloseUSD', 'Volume': 'EthVolume'},
+        'how': 'inner',
+    },
+    {
+        # Etherscan data - https://etherscan.io/charts
+        'name': 'tx_growth',
+        'path': 'data/export-TxGrowth.csv',
+        'date_column': 'UnixTimeStamp',
+        'date_unit': 's',
+        'dtypes': {'Value': 'int64'},
+        'rename': {'Value': 'TransactionsAmount'},
+        'aggregations': {'TransactionsAmount': 'sum'},
+        'how': 'inner',
+    },
+    {
+        'name': 'block_size',
+        'path': 'data/export-BlockSize.csv',
+        'date_column': 'UnixTimeStamp',
+        'date_unit': 's',
+        'dtypes': {'Value': 'int64'},
+        'rename': {'Value': 'BlockSize'},
+        'how': 'inner',
+    },
+    {
+        'name': 'eth_burnt',
+        'path': 'data/export-DailyEthBurnt.csv',
+        'date_column': 'Date(UTC)',
+        'date_format': '%m/%d/%Y',
+        'dtypes': {'BurntFees': 'float64'},
+        'rename': {'BurntFees': 'DailyEthBurnt'},
+        'aggregations': {'DailyEthBurnt': 'sum'},
+        'how': 'left',
+    },
+    {
+        'name': 'daily_active_address',
+        'path': 'data/export-DailyActiveEthAddress.csv',
+        'date_column': 'Date(UTC)',
+        'date_format': '%m/%d/%Y',
+        'dtypes': {'Unique Address Total Count': 'int64', 'Unique Address Receive Count': 'int64', 'Unique Address Sent Count': 'int64'},
+        'rename': {'Unique Address Total Count': 'UniqueAddressTotalCount', 'Unique Address Receive Count': 'UniqueAddressReceiveCount', 'Unique Address Sent Count': 'UniqueAddressSentCount'},
+        'how': 'inner',
+    },
+]
@@ -0,0 +1,98 @@
+import json
+import os
+import sys
+import threading
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+import pytest
+
+# The modules live at the top of the repository
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+
+class StubServer:
+    """Local HTTP server answering every GET with respond(path, query)
+
+    respond returns (status, headers, body), a body that is not bytes is sent as JSON.
+    The query of every request is kept in `requests`, in the order they arrived."""
+
+    def __init__(self, respond):
+        self.respond = respond
+        self.requests = []
+        self._lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                query = {key: values[0] for key, values in parse_qs(url.query).items()}
+                with stub._lock:
+                    stub.requests.append(query)
+                status, headers, body = stub.respond(url.path, query)
+                if not isinstance(body, bytes):
+                    body = json.dumps(body).encode()
+
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f'http://127.0.0.1:{self.server.server_port}'
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def stub_server():
+    """Returns a function starting a StubServer, every server is stopped after the test"""
+    servers = []
+
+    def start(respond):
+        server = StubServer(respond)
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.close()
+
+
+@pytest.fixture
+def config_file(tmp_path):
+    """Returns the path of a config.yaml holding test API keys"""
+    path = tmp_path / 'config.yaml'
+    path.write_text('keys:\n    owlracle_api: "test"\n    etherscan_api: "test"\n')
+    return str(path)
+
+
+@pytest.fixture
+def owlracle_history():
+    """Returns a function creating stub responders of the Owlracle history endpoint
+
+    The responder of history(offset) puts one candle in every slot of the requested timeframe,
+    stamped `offset` seconds after the slot starts, like the real API stamps daily candles at
+    about 23:00. The candles stamped between from and to, both included, are returned newest
+    first, at most `candles` of them."""
+    def history(offset=0):
+        def respond(path, query):
+            step = int(query['timeframe']) * 60
+            from_time, to_time = int(query['from']), int(query['to'])
+
+            stamps = [slot + offset for slot in range((from_time - offset) // step * step, to_time + 1, step)]
+            candles = [{'timestamp': datetime.fromtimestamp(stamp, timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.000Z'),
+                        'gasPrice': {'open': 1.0, 'close': 2.0, 'low': 0.5, 'high': 3.0},
+                        'avgGas': float(stamp // step), 'samples': 10}
+                       for stamp in stamps if from_time <= stamp <= to_time]
+            return 200, {}, {'candles': candles[::-1][:int(query['candles'])]}
+        return respond
+    return history
@@ -0,0 +1,63 @@
+import time
+from owlracle import OwlracleConnection
+from candle_cache import CandleCache
+from backfill import BackfillJob
+from ratelimit import TokenBucket
+
+DAY = 86400
+
+# 2023-01-18 00:00 UTC
+START = 1674000000
+
+
+def make_job(server, config_file, tmp_path, days, **kwargs):
+    cache = CandleCache(OwlracleConnection(config_file, base_url=server.url), str(tmp_path / 'candles.sqlite'))
+    return BackfillJob(cache, 'eth', START, START + days * DAY - 1, timeframe=1440, limiter=TokenBucket(1000),
+                       base_delay=0.01, directory=str(tmp_path / 'backfill'), **kwargs)
+
+
+def test_429_and_5xx_are_retried_honouring_retry_after(stub_server, config_file, owlracle_history, tmp_path):
+    history = owlracle_history()
+    responses = [(429, {'Retry-After': '1'}, {}), (503, {}, {})]
+    server = stub_server(lambda path, query: responses.pop(0) if responses else history(path, query))
+    job = make_job(server, config_file, tmp_path, 10)
+
+    start = time.perf_counter()
+    checkpoint = job.run()
+
+    assert time.perf_counter() - start >= 1
+    assert checkpoint['requests'] == 3 and checkpoint['retries'] == 2
+    assert checkpoint['failed'] == []
+    assert job.pending() == []
+    assert len(job.cache.load('eth', START, START + 10 * DAY - 1)) == 10
+
+
+def test_failed_window_is_resumed_by_the_next_run(stub_server, config_file, owlracle_history, tmp_path):
+    history = owlracle_history()
+    broken = {START + 10 * DAY}
+    server = stub_server(lambda path, query: (500, {}, {}) if int(query['from']) in broken else history(path, query))
+
+    # Three windows of 10 candles, the middle one keeps failing
+    job = make_job(server, config_file, tmp_path, 30, candles=10, max_retries=1)
+    checkpoint = job.run()
+    assert checkpoint['failed'] == [[START + 10 * DAY, START + 20 * DAY - 1]]
+    assert job.pending() == [(START + 10 * DAY, START + 20 * DAY - 1)]
+    assert len(server.requests) == 4
+
+    # A new job with the same arguments only fetches the failed window
+    broken.clear()
+    resumed = make_job(server, config_file, tmp_path, 30, candles=10)
+    checkpoint = resumed.run()
+    assert len(server.requests) == 5
+    assert checkpoint['failed'] == [] and len(checkpoint['completed']) == 3
+    assert resumed.pending() == []
+    assert len(resumed.cache.load('eth', START, START + 30 * DAY - 1)) == 30
+
+
+def test_other_errors_are_not_retried(stub_server, config_file, tmp_path):
+    server = stub_server(lambda path, query: (404, {}, {}))
+    job = make_job(server, config_file, tmp_path, 10)
+
+    checkpoint = job.run()
+    assert len(server.requests) == 1
+    assert checkpoint['failed'] == [[START, START + 10 * DAY - 1]]
@@ -0,0 +1,34 @@
+from owlracle import OwlracleConnection
+from candle_cache import CandleCache
+
+DAY = 86400
+
+# 2023-01-18 00:00 UTC
+START = 1674000000
+
+# Owlracle stamps the daily candles at about 23:00:42 of their day
+STAMP_OFFSET = 23 * 3600 + 42
+
+
+def test_range_ending_mid_slot_is_fetched_again_once_extended(stub_server, config_file, owlracle_history, tmp_path):
+    server = stub_server(owlracle_history(STAMP_OFFSET))
+    cache = CandleCache(OwlracleConnection(config_file, base_url=server.url), str(tmp_path / 'candles.sqlite'))
+
+    # Ends at 23:00:00 of 2023-01-20, before that day's candle is stamped
+    first = cache.get_average_gas_price('eth', START, START + 2 * DAY + 23 * 3600)
+    assert len(first) == 2
+    assert cache.missing_intervals('eth', START, START + 2 * DAY + 23 * 3600) == [(START + 2 * DAY, START + 2 * DAY + 23 * 3600)]
+
+    # The extended range fetches the day the first range cut off
+    second = cache.get_average_gas_price('eth', START, START + 3 * DAY - 1)
+    assert second['Timestamp'].str[:10].tolist() == ['2023-01-20', '2023-01-19', '2023-01-18']
+    assert cache.missing_intervals('eth', START, START + 3 * DAY - 1) == []
+
+
+def test_whole_slot_without_candle_is_not_requested_again(stub_server, config_file, tmp_path):
+    server = stub_server(lambda path, query: (200, {}, {'candles': []}))
+    cache = CandleCache(OwlracleConnection(config_file, base_url=server.url), str(tmp_path / 'candles.sqlite'))
+
+    assert len(cache.get_average_gas_price('eth', START, START + 2 * DAY - 1)) == 0
+    assert cache.get_average_gas_price('eth', START, START + 2 * DAY - 1) is not None
+    assert len(server.requests) == 1
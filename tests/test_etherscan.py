@@ -0,0 +1,65 @@
+import csv
+import os
+import pytest
+import etherscan
+from etherscan import EtherscanConnection, ETHERSCAN_SERIES
+from ratelimit import TokenBucket
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+
+def read_export(path):
+    with open(os.path.join(ROOT, path), 'r', newline='') as f:
+        return list(csv.reader(f))[1:]
+
+
+@pytest.fixture
+def series(tmp_path, monkeypatch):
+    """Points every series at a file in tmp_path, returns name -> (hand export path, test path)"""
+    paths = {}
+    patched = {}
+    for name, (action, field, path, header) in ETHERSCAN_SERIES.items():
+        paths[name] = (path, str(tmp_path / os.path.basename(path)))
+        patched[name] = (action, field, paths[name][1], header)
+    monkeypatch.setattr(etherscan, 'ETHERSCAN_SERIES', patched)
+    return paths
+
+
+def chart_api(rejected=()):
+    """Returns a stub responder of the daily statistics endpoints serving the rows of the hand exports"""
+    actions = {action: (field, path) for action, field, path, _ in ETHERSCAN_SERIES.values()}
+
+    def respond(path, query):
+        if query['action'] in rejected:
+            return 200, {}, {'status': '0', 'message': 'NOTOK', 'result': 'API Pro endpoint'}
+        field, export = actions[query['action']]
+        rows = [{'UTCDate': day, 'unixTimeStamp': timestamp, field: value} for day, timestamp, value in read_export(export)]
+        return 200, {}, {'status': '1', 'message': 'OK', 'result': rows}
+    return respond
+
+
+def test_refresh_writes_the_format_of_the_hand_export(stub_server, config_file, series):
+    server = stub_server(chart_api())
+    connection = EtherscanConnection(config_file, base_url=server.url, limiter=TokenBucket(1000))
+
+    assert sorted(connection.refresh_exports()) == sorted(ETHERSCAN_SERIES)
+
+    # One request per series
+    assert sorted(query['action'] for query in server.requests) == sorted(value[0] for value in ETHERSCAN_SERIES.values())
+    for export, written in series.values():
+        with open(os.path.join(ROOT, export), 'rb') as f, open(written, 'rb') as g:
+            assert g.read() == f.read()
+
+
+def test_rejected_series_keeps_its_file(stub_server, config_file, series, capsys):
+    server = stub_server(chart_api(rejected={'dailytx'}))
+    connection = EtherscanConnection(config_file, base_url=server.url, limiter=TokenBucket(1000))
+    with open(series['tx_growth'][1], 'w') as f:
+        f.write('old export\n')
+
+    assert sorted(connection.refresh_exports()) == ['avg_gas_price', 'block_size']
+
+    with open(series['tx_growth'][1], 'r') as f:
+        assert f.read() == 'old export\n'
+    assert not os.path.exists(series['tx_growth'][1] + '.tmp')
+    assert 'tx_growth (dailytx) could not be fetched, rejected by the API: API Pro endpoint' in capsys.readouterr().out
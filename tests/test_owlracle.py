@@ -0,0 +1,41 @@
+import pandas as pd
+from owlracle import OwlracleConnection
+
+HOUR = 3600
+
+# 2023-01-18 00:00 UTC
+START = 1674000000
+
+
+def test_history_is_fetched_in_windows_and_stitched(stub_server, config_file, owlracle_history):
+    server = stub_server(owlracle_history())
+    connection = OwlracleConnection(config_file, base_url=server.url, max_workers=3)
+
+    data = connection.get_gas_price_history('eth', START, START + 25 * HOUR, timeframe=60, candles=10)
+
+    # 26 candles, at most 10 per request, the windows share their boundary
+    assert sorted((int(query['from']), int(query['to'])) for query in server.requests) == [
+        (START, START + 9 * HOUR), (START + 9 * HOUR, START + 18 * HOUR), (START + 18 * HOUR, START + 25 * HOUR)]
+
+    # The candles on the shared window boundaries came back twice and are kept once, newest first
+    expected = pd.date_range(pd.Timestamp(START + 25 * HOUR, unit='s', tz='UTC'), periods=26, freq='-1h')
+    assert data['Timestamp'].tolist() == expected.tolist()
+    assert data['avgGas'].is_monotonic_decreasing
+
+
+def test_history_returns_none_when_a_window_fails(stub_server, config_file, owlracle_history):
+    history = owlracle_history()
+    server = stub_server(lambda path, query: (500, {}, {}) if int(query['from']) > START else history(path, query))
+    connection = OwlracleConnection(config_file, base_url=server.url)
+
+    assert connection.get_gas_price_history('eth', START, START + 25 * HOUR, timeframe=60, candles=10) is None
+
+
+def test_history_without_api_key_makes_no_request(stub_server, tmp_path, owlracle_history):
+    server = stub_server(owlracle_history())
+    config = tmp_path / 'empty.yaml'
+    config.write_text('keys: {}\n')
+    connection = OwlracleConnection(str(config), base_url=server.url)
+
+    assert connection.get_gas_price_history('eth', START, START + 25 * HOUR, timeframe=60) is None
+    assert server.requests == []
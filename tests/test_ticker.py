@@ -0,0 +1,54 @@
+import threading
+import time
+from ticker import LiveTicker, parse_eth_price, parse_gas_price
+
+
+def test_sources_are_polled_and_served_from_memory(stub_server):
+    server = stub_server(lambda path, query: (200, {}, {'ethereum': {'usd': 1234.5}} if path == '/price'
+                                              else {'result': {'FastGasPrice': '21'}}))
+    ticker = LiveTicker({'eth_price': (server.url + '/price', parse_eth_price),
+                         'gas_price': (server.url + '/gas', parse_gas_price)}, ttl=60)
+
+    ticker.refresh()
+    assert len(server.requests) == 2
+
+    price = ticker.get('eth_price')
+    assert price['value'] == 1234.5 and not price['stale'] and price['error'] is None
+    assert ticker.get('gas_price')['value'] == '21'
+
+    # Reading does not call the upstream APIs again
+    ticker.get('eth_price')
+    ticker.get('gas_price')
+    assert len(server.requests) == 2
+
+
+def test_failed_poll_keeps_the_last_value_and_reports_the_error(stub_server):
+    failing = threading.Event()
+    server = stub_server(lambda path, query: (503, {}, {}) if failing.is_set() else (200, {}, {'ethereum': {'usd': 1000}}))
+    ticker = LiveTicker({'eth_price': (server.url, parse_eth_price)}, ttl=0.1)
+
+    ticker.refresh()
+    failing.set()
+    time.sleep(0.2)
+    ticker.refresh()
+
+    price = ticker.get('eth_price')
+    assert price['value'] == 1000
+    assert price['stale']
+    assert '503' in price['error']
+
+
+def test_concurrent_fetches_share_one_request(stub_server):
+    release = threading.Event()
+
+    def respond(path, query):
+        release.wait(5)
+        return 200, {}, {'ethereum': {'usd': 1}}
+
+    server = stub_server(respond)
+    ticker = LiveTicker({'eth_price': (server.url, parse_eth_price)})
+
+    futures = [ticker.fetch('eth_price') for _ in range(5)]
+    release.set()
+    assert [future.result() for future in futures] == [1] * 5
+    assert len(server.requests) == 1
@@ -0,0 +1,128 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+import requests
+
+COINGECKO_PRICE_URL = "https://api.coingecko.com/api/v3/simple/price?ids=ethereum&vs_currencies=usd"
+ETHERSCAN_GAS_URL = "https://api.etherscan.io/api?module=gastracker&action=gasoracle&apikey=MY1ZUXNND2FTM1T14ZVZ9QRT1D95PAVQUI"
+
+
+def parse_eth_price(data):
+    return data['ethereum']['usd']
+
+
+def parse_gas_price(data):
+    return data['result']['FastGasPrice']
+
+
+# Live values shown on the homepage: name -> (url, function extracting the value from the JSON)
+TICKER_SOURCES = {
+    'eth_price': (COINGECKO_PRICE_URL, parse_eth_price),
+    'gas_price': (ETHERSCAN_GAS_URL, parse_gas_price),
+}
+
+
+class LiveTicker:
+    """Serves the latest live values from memory while a background thread keeps them fresh
+
+    All sources are polled concurrently every `interval` seconds. Readers never wait for
+    the upstream APIs once a value is known; a value older than `ttl` seconds is reported
+    as stale. Concurrent requests for the same source share one in-flight fetch."""
+
+    def __init__(self, sources=TICKER_SOURCES, interval=30, ttl=120, timeout=5):
+        """sources: name -> (url, parser) of the values to poll
+        interval: seconds between two polls
+        ttl: age in seconds after which a value is stale
+        timeout: seconds to wait for one upstream request"""
+        self.sources = sources
+        self.interval = interval
+        self.ttl = ttl
+        self.timeout = timeout
+
+        self._values = {}
+        self._errors = {}
+        self._in_flight = {}
+        self._lock = threading.Lock()
+        self._session = requests.Session()
+        self._executor = ThreadPoolExecutor(max_workers=len(sources))
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _fetch(self, name):
+        url, parser = self.sources[name]
+        try:
+            res = self._session.get(url, timeout=self.timeout)
+            res.raise_for_status()
+            value = parser(res.json())
+            error = None
+        except (requests.RequestException, ValueError, KeyError, TypeError) as e:
+            value = None
+            error = str(e)
+
+        with self._lock:
+            if error is None:
+                self._values[name] = (value, time.time())
+                self._errors.pop(name, None)
+            else:
+                self._errors[name] = error
+            self._in_flight.pop(name, None)
+        return value
+
+    def fetch(self, name):
+        """Starts fetching a source unless a fetch for it is already running
+
+        Returns: future of the fetched value (None if the fetch failed)"""
+        with self._lock:
+            future = self._in_flight.get(name)
+            if future is None:
+                future = self._executor.submit(self._fetch, name)
+                self._in_flight[name] = future
+            return future
+
+    def refresh(self):
+        """Fetches all sources concurrently and waits for them"""
+        for future in [self.fetch(name) for name in self.sources]:
+            future.result()
+
+    def _poll(self):
+        while not self._stop.is_set():
+            self.refresh()
+            self._stop.wait(self.interval)
+
+    def start(self):
+        """Starts the background polling thread"""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._poll, name='live-ticker', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def get(self, name, wait=0):
+        """Returns the latest value of a source
+
+        name: source name
+        wait: seconds to wait for a fetch if no value is known yet
+
+        Returns: dict with 'value' (None if never fetched), 'age' in seconds, 'stale' and 'error'"""
+        with self._lock:
+            cached = self._values.get(name)
+        if cached is None and wait:
+            future = self.fetch(name)
+            try:
+                future.result(timeout=wait)
+            except TimeoutError:
+                pass
+            with self._lock:
+                cached = self._values.get(name)
+
+        with self._lock:
+            error = self._errors.get(name)
+        if cached is None:
+            return {'value': None, 'age': None, 'stale': True, 'error': error}
+
+        value, fetched_at = cached
+        age = time.time() - fetched_at
+        return {'value': value, 'age': age, 'stale': age > self.ttl, 'error': error}
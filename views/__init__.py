@@ -0,0 +1,16 @@
+import importlib
+
+# Pages of the app: label -> (module, class), a page's module is only imported when it is shown
+PAGES = {
+    "Homepage": ('views.home', 'HomePage'),
+    "Graphical Comparison": ('views.graphical', 'GraphicalComparisonPage'),
+    "Statistical Comparison": ('views.statistical', 'StatisticalComparisonPage'),
+    "Event Study": ('views.events', 'EventStudyPage'),
+    "Cross-Correlation": ('views.correlation', 'CrossCorrelationPage'),
+}
+
+
+def load_page(label):
+    """Imports the module of a page and returns a new instance of the page"""
+    module, name = PAGES[label]
+    return getattr(importlib.import_module(module), name)()
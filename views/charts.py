@@ -0,0 +1,83 @@
+import streamlit as st
+import pandas as pd
+import plotly.graph_objects as go
+from decimation import decimate, envelope
+from views.common import get_figure_cache, get_recorder, timed
+
+# Most points drawn per line, about two per pixel of a default width chart
+CHART_POINT_BUDGET = 1500
+
+
+class ChartPage:
+    """Base of the pages drawing Plotly charts"""
+
+    # Dates drawn by add_line, the whole series if None
+    date_range = None
+
+    # Resolution of the data drawn, part of the key of every cached figure
+    resolution = None
+
+    def sidebar(self):
+        """Adds the page's own controls to the sidebar"""
+
+    @timed('figure')
+    def select_dates(self, data, resolution=None):
+        """Returns the rows of the periods overlapping the selected date range
+
+        Rollups are labelled the way resample labels them, weekly and monthly periods by their
+        last day, so the range is mapped to the labels of the periods holding its first and last
+        moment instead of being compared with the labels directly.
+
+        resolution: rollup level of the data, defaults to the page's resolution"""
+        if self.date_range is None:
+            return data
+        start, end = self.date_range
+        moments = pd.Series(0, index=pd.DatetimeIndex([start, end + pd.Timedelta(days=1) - pd.Timedelta(1, 'ns')]))
+        labels = moments.resample(resolution or self.resolution).sum().index
+        return data.loc[labels[0]:labels[-1]]
+
+    def add_line(self, fig, data, column, resolution=None, **kwargs):
+        """Adds a line for a column, reduced to the chart's point budget
+
+        Only the selected date range is drawn, so narrowing it shows more detail. When
+        points are dropped, a band with the minimum and maximum of the hidden points is
+        drawn behind the line.
+
+        resolution: rollup level of the data, defaults to the page's resolution"""
+        series = self.select_dates(data[column], resolution)
+        x, y, decimated = decimate(series.index.to_numpy(), series.to_numpy(), CHART_POINT_BUDGET)
+
+        fig.add_trace(go.Scatter(x=x, y=y, **kwargs))
+
+        if decimated:
+            series = series.dropna()
+            band_x, low, high = envelope(series.index.to_numpy(), series.to_numpy(), CHART_POINT_BUDGET // 2)
+            fig.add_trace(go.Scatter(x=band_x, y=high, mode='lines', line=dict(width=0), showlegend=False, hoverinfo='skip'))
+            fig.add_trace(go.Scatter(x=band_x, y=low, mode='lines', line=dict(width=0), fill='tonexty', fillcolor='rgba(128, 128, 128, 0.15)',
+                                     name=f"{kwargs.get('name', column)} range", hoverinfo='skip'))
+
+    @timed('figure')
+    def show_figure(self, fig):
+        st.plotly_chart(fig)
+
+    def show_cached_figure(self, section, selection, version, build):
+        """Shows a figure from the figure cache, building it only for a combination not drawn before
+
+        The figure is keyed by the section, the user's selection, the page's resolution and
+        date range and the version of the data it is drawn from, so any change of them
+        builds a new figure while widget interactions on unchanged data reuse the stored one.
+
+        section: name of the section drawing the figure
+        selection: hashable choices of the user the figure depends on, e.g. the selected metric
+        version: version of the data drawn, e.g. from dataset_version()
+        build: function returning the go.Figure"""
+        key = (section, selection, self.resolution, self.date_range, version)
+        recorder = get_recorder()
+
+        def build_figure():
+            recorder.cache_miss('figure')
+            return build()
+
+        with recorder.cache_lookup('figure'):
+            fig, _ = get_figure_cache().get_or_build(key, build_figure)
+        self.show_figure(fig)
@@ -0,0 +1,36 @@
+import functools
+import os
+import streamlit as st
+from instrumentation import Recorder
+from figure_cache import FigureCache
+
+# Timings of the sections are appended to this JSON lines file, an empty value disables the log
+TIMING_LOG = os.environ.get('APP_TIMING_LOG', 'logs/app_timings.jsonl')
+
+# Limits of the figures kept for every session: number of figures and bytes of their JSON specs
+FIGURE_CACHE_ENTRIES = 256
+FIGURE_CACHE_BYTES = 64 * 2**20
+
+
+@st.cache_resource
+def get_recorder():
+    """Returns the timing and cache recorder shared by every session"""
+    return Recorder(TIMING_LOG or None)
+
+
+@st.cache_resource
+def get_figure_cache():
+    """Returns the built chart figures shared by every session"""
+    return FigureCache(FIGURE_CACHE_ENTRIES, FIGURE_CACHE_BYTES)
+
+
+def timed(stage=None):
+    """Records the wall time of a function as a section, or as a stage of the running section"""
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            recorder = get_recorder()
+            with recorder.stage(stage) if stage else recorder.section(function.__name__):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,101 @@
+import streamlit as st
+import plotly.graph_objects as go
+from etl import available_rollups, ROLLUP_LEVELS
+from cross_correlation import period_correlations, peak_lags
+from views.common import get_recorder, timed
+from views.charts import ChartPage
+from views.data import _load_rollup, _rollup_version, UPDATE_DATE
+
+# Unit of a lag at every resolution
+LAG_UNITS = {'h': 'hours', 'D': 'days', 'W': 'weeks', 'ME': 'months'}
+
+PERIODS = {'before': 'Before Update', 'after': 'After Update'}
+
+
+@st.cache_resource(max_entries=16)
+def _load_correlations(resolution, max_lag, differences, version):
+    get_recorder().cache_miss('correlation')
+    correlations = period_correlations(_load_rollup(None, resolution, version), UPDATE_DATE, max_lag, differences)
+    peaks = {period: peak_lags(correlations.xs(period, level='period')) for period in PERIODS}
+    return correlations, peaks
+
+
+@timed('compute')
+def load_correlations(resolution, max_lag, differences):
+    """Returns the lagged correlations of every pair of metrics before and after the update and their peaks
+
+    Computed once per process, dataset version and parameters, see period_correlations."""
+    with get_recorder().cache_lookup('correlation'):
+        return _load_correlations(resolution, max_lag, differences, _rollup_version(resolution))
+
+
+class CrossCorrelationPage(ChartPage):
+
+    def __init__(self):
+        self.resolution = 'D'
+        self.max_lag = 30
+        self.differences = True
+
+    def sidebar(self):
+        # Hourly data is only offered when the ETL wrote an hourly rollup
+        resolutions = available_rollups() or ['D', 'W', 'ME']
+        self.resolution = st.sidebar.selectbox("Resolution", resolutions, index=resolutions.index('D') if 'D' in resolutions else 0,
+                                               format_func=lambda level: ROLLUP_LEVELS[level][0])
+        self.max_lag = st.sidebar.slider(f"Largest lag ({LAG_UNITS[self.resolution]})", min_value=1, max_value=365, value=30)
+        self.differences = st.sidebar.checkbox("Correlate changes instead of levels", value=True,
+                                               help="Removes the common trend of metrics that all grow over time")
+
+    @timed()
+    def cross_correlation_section(self):
+        unit = LAG_UNITS[self.resolution]
+
+        st.header("Lead/Lag Cross-Correlation")
+        st.markdown(f"""Every metric is correlated with every other metric shifted by up to {self.max_lag} {unit} in either direction, separately before and after the London Upgrade.
+        A strong correlation at a positive lag means the first metric moves before the second one.""")
+
+        correlations, peaks = load_correlations(self.resolution, self.max_lag, self.differences)
+        version = _rollup_version(self.resolution)
+        metrics = list(correlations.columns)
+
+        # Strongest correlation of every pair over all lags
+        period = st.selectbox("Period", list(PERIODS), format_func=PERIODS.get)
+        peak = peaks[period]
+
+        def build_heatmap():
+            values = peak['correlation'].unstack('follower').loc[metrics, metrics]
+            lags = peak['lag'].unstack('follower').loc[metrics, metrics]
+            fig = go.Figure(go.Heatmap(z=values.to_numpy(), x=metrics, y=metrics, customdata=lags.to_numpy(),
+                                       zmin=-1, zmax=1, colorscale='RdBu', reversescale=True,
+                                       hovertemplate=f'%{{y}} leads %{{x}}<br>correlation %{{z:.2f}} at lag %{{customdata}} {unit}<extra></extra>'))
+            fig.update_layout(title=f'Strongest Correlation of every Pair ({PERIODS[period]})', xaxis_title='Follower', yaxis_title='Leader',
+                              height=700)
+            return fig
+
+        self.show_cached_figure('correlation_heatmap', (period, self.max_lag, self.differences), version, build_heatmap)
+
+        # Correlation of one pair at every lag
+        col1, col2 = st.columns(2)
+        with col1:
+            leader = st.selectbox("Leader", metrics, index=metrics.index('average_gas_price') if 'average_gas_price' in metrics else 0)
+        with col2:
+            follower = st.selectbox("Follower", metrics, index=metrics.index('TransactionsAmount') if 'TransactionsAmount' in metrics else 0)
+
+        def build_pair():
+            fig = go.Figure()
+            for name, label in PERIODS.items():
+                pair = correlations.xs((name, leader), level=['period', 'leader'])[follower]
+                fig.add_trace(go.Scatter(x=pair.index, y=pair.to_numpy(), mode='lines', name=label))
+            fig.add_vline(x=0, line=dict(color='orange', dash='dash'))
+            fig.update_layout(title=f'Correlation of {leader} with {follower} at every Lag', xaxis_title=f'Lag ({unit})',
+                              yaxis_title='Correlation', legend=dict(yanchor="top", y=0.99, xanchor="left", x=0.01))
+            return fig
+
+        self.show_cached_figure('correlation_pair', (leader, follower, self.max_lag, self.differences), version, build_pair)
+
+        # Peaks of the leader with every metric in both periods
+        table = peaks['before'].xs(leader, level='leader').join(peaks['after'].xs(leader, level='leader'), lsuffix='_before', rsuffix='_after')
+        st.dataframe(table.style.format('{:.2f}', subset=['correlation_before', 'correlation_after'])
+                     .format('{:.0f}', subset=['lag_before', 'lag_after']))
+
+    def render(self):
+        self.cross_correlation_section()
@@ -0,0 +1,75 @@
+import os
+import streamlit as st
+from etl import read_dataset, dataset_version, freeze, rollup, rollup_path
+from period_summary import period_summary
+from event_study import EVENTS
+from views.common import get_recorder, timed
+
+GAS_PRICE_METRICS = ('average_gas_price', 'GasPriceOpen', 'GasPriceClose', 'GasPriceLow', 'GasPriceHigh')
+ETH_PRICE_METRICS = ('EthPriceOpenUSD', 'EthPriceHighUSD', 'EthPriceLowUSD', 'EthPriceCloseUSD')
+USER_METRICS = ('UniqueAddressTotalCount', 'UniqueAddressReceiveCount', 'UniqueAddressSentCount')
+
+# Highlight the date of the update (August 5th, 2021)
+UPDATE_DATE = EVENTS['London']
+
+# Resolution shown until the user picks another one
+DEFAULT_RESOLUTION = 'W'
+
+
+@st.cache_resource(max_entries=2)
+def load_dataset(version):
+    """Returns the daily dataset shared read-only by every session of this process
+
+    version: key from dataset_version(), a new key reloads the dataset"""
+    get_recorder().cache_miss('dataset')
+
+    # Memory-map the columnar dataset, columns are only paged in when they are used
+    data = read_dataset().set_index('Date')
+
+    return freeze(data)
+
+
+def _rollup_version(resolution):
+    path = rollup_path(resolution)
+    return dataset_version(path, path) if os.path.exists(path) else dataset_version()
+
+
+@st.cache_resource(max_entries=64)
+def _load_rollup(columns, resolution, version):
+    get_recorder().cache_miss('dataset')
+    path = rollup_path(resolution)
+    if os.path.exists(path):
+        # Memory-map the rollup precomputed by the ETL
+        data = read_dataset(columns, path=path, csv_path=path).set_index('Date')
+    else:
+        # Roll the daily data up if the ETL has not written this resolution
+        data = load_dataset(dataset_version())
+        if columns is not None:
+            data = data[list(columns)]
+        data = rollup(data, resolution)
+
+    return freeze(data)
+
+
+@timed('load')
+def load_data(columns=None, resolution=DEFAULT_RESOLUTION):
+    """Returns the dataset at a resolution of ROLLUP_LEVELS and the update date
+
+    The frame is built once per process and dataset version and shared by all callers
+    without copying, so it must not be modified."""
+    with get_recorder().cache_lookup('dataset'):
+        data = _load_rollup(columns, resolution, _rollup_version(resolution))
+    return data, UPDATE_DATE
+
+
+@st.cache_resource(max_entries=64)
+def _load_summary(columns, resolution, version):
+    get_recorder().cache_miss('summary')
+    return period_summary(_load_rollup(columns, resolution, version), UPDATE_DATE)
+
+
+@timed('compute')
+def load_summary(columns=None, resolution=DEFAULT_RESOLUTION):
+    """Returns the before/after update statistics of the dataset at a resolution, see period_summary"""
+    with get_recorder().cache_lookup('summary'):
+        return _load_summary(columns, resolution, _rollup_version(resolution))
@@ -0,0 +1,57 @@
+import streamlit as st
+import plotly.graph_objects as go
+from etl import dataset_version
+from event_study import event_study, EVENTS, WINDOWS
+from views.common import get_recorder, timed
+from views.charts import ChartPage
+from views.data import load_dataset
+
+
+@st.cache_resource(max_entries=2)
+def _load_event_study(version):
+    get_recorder().cache_miss('events')
+    return event_study(load_dataset(version))
+
+
+@timed('compute')
+def load_event_study():
+    """Returns the pre/post event statistics of every metric of the daily dataset, see event_study"""
+    with get_recorder().cache_lookup('events'):
+        return _load_event_study(dataset_version())
+
+
+class EventStudyPage(ChartPage):
+
+    @timed()
+    def event_study_section(self):
+        st.header("Event Study")
+        st.markdown("""Every metric is compared in windows of the same length before and after each protocol upgrade, instead of over the whole history on each side of the London Upgrade.""")
+
+        results = load_event_study()
+
+        col1, col2 = st.columns(2)
+        with col1:
+            event = st.selectbox("Event", list(EVENTS), format_func=lambda name: f"{name} ({EVENTS[name].date()})")
+        with col2:
+            window = st.selectbox("Window", WINDOWS, index=WINDOWS.index(30), format_func=lambda days: f"{days} days")
+
+        table = results.xs((event, window), level=['event', 'window'])
+        if (table['n_post'] == 0).all():
+            st.info(f"The dataset ends before the {event} upgrade, update the data to include it.")
+        st.dataframe(table.style.format('{:.2f}', subset=['mean_pre', 'mean_post', 'std_pre', 'std_post', 'mean_change', 't_stat']))
+
+        # Change of one metric for every event and window
+        metric = st.selectbox("Metric", list(results.index.unique('metric')))
+        changes = results.xs(metric, level='metric')['mean_change'].unstack('event')[list(EVENTS)]
+
+        def build():
+            fig = go.Figure()
+            for name in changes.columns:
+                fig.add_trace(go.Bar(x=[f"{days} days" for days in changes.index], y=changes[name], name=name))
+            fig.update_layout(title=f'Change of the mean of {metric} after every event', xaxis_title='Window', yaxis_title='Change (%)', barmode='group')
+            return fig
+
+        self.show_cached_figure('event_changes', (metric,), dataset_version(), build)
+
+    def render(self):
+        self.event_study_section()
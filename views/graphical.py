@@ -0,0 +1,517 @@
+import os
+import streamlit as st
+import pandas as pd
+import plotly.graph_objects as go
+from etl import dataset_version, freeze, available_rollups, ROLLUP_LEVELS
+from period_summary import period_summary
+from panel import read_panel, rollup_panel, panel_summary, panel_networks, PANEL_PATH, PANEL_CSV_PATH
+from rolling_stats import read_rolling, rolling_paths
+from sources import NETWORKS
+from views.common import get_recorder, timed
+from views.charts import ChartPage
+from views.data import (load_dataset, load_data, load_summary, _rollup_version, GAS_PRICE_METRICS, ETH_PRICE_METRICS,
+                        USER_METRICS, UPDATE_DATE, DEFAULT_RESOLUTION)
+
+
+def _panel_version():
+    path = PANEL_PATH if os.path.exists(PANEL_PATH) else PANEL_CSV_PATH
+    return dataset_version(path, path)
+
+
+@st.cache_resource(max_entries=16)
+def _load_panel(columns, resolution, version):
+    get_recorder().cache_miss('dataset')
+    return freeze(rollup_panel(read_panel(columns), resolution))
+
+
+@timed('load')
+def load_panel(columns=None, resolution=DEFAULT_RESOLUTION):
+    """Returns the gas prices of every network at a resolution, indexed by (network, Date)"""
+    with get_recorder().cache_lookup('dataset'):
+        return _load_panel(columns, resolution, _panel_version())
+
+
+def load_gas_data(network, resolution=DEFAULT_RESOLUTION):
+    """Returns the gas prices of a network and their before/after update statistics
+
+    Ethereum is read from the merged dataset, the other networks from the panel."""
+    if network == 'eth':
+        data, _ = load_data(GAS_PRICE_METRICS, resolution)
+        return data, load_summary(GAS_PRICE_METRICS, resolution)
+
+    data = load_panel(GAS_PRICE_METRICS, resolution).xs(network, level='network')
+    return data, period_summary(data, UPDATE_DATE)
+
+
+def _rolling_version(network):
+    path = rolling_paths(network, 1440)[1]
+    return dataset_version(path, path) if os.path.exists(path) else None
+
+
+@st.cache_resource(max_entries=8)
+def _load_rolling(network, version):
+    get_recorder().cache_miss('dataset')
+    data = read_rolling(network)
+    return None if data is None else freeze(data)
+
+
+@timed('load')
+def load_rolling(network='eth'):
+    """Returns the daily rolling gas price statistics kept up to date by the ETL, None if there are none"""
+    with get_recorder().cache_lookup('dataset'):
+        return _load_rolling(network, _rolling_version(network))
+
+
+class GraphicalComparisonPage(ChartPage):
+
+    def __init__(self):
+        self.resolution = DEFAULT_RESOLUTION
+        self.networks = panel_networks() or ['eth']
+        self.network = 'eth'
+
+        dates = load_dataset(dataset_version()).index
+        self.date_range = (dates.min(), dates.max())
+
+    def sidebar(self):
+        # Resolution of the graphs, every option is precomputed by the ETL
+        resolutions = available_rollups() or [level for level in ROLLUP_LEVELS if ROLLUP_LEVELS[level][1] >= ROLLUP_LEVELS['D'][1]]
+        self.resolution = st.sidebar.selectbox("Resolution", resolutions, index=resolutions.index(DEFAULT_RESOLUTION) if DEFAULT_RESOLUTION in resolutions else 0,
+                                               format_func=lambda level: ROLLUP_LEVELS[level][0])
+
+        # Network of the gas price graph, every network in the panel can be selected
+        if len(self.networks) > 1:
+            self.network = st.sidebar.selectbox("Network", self.networks, format_func=lambda network: NETWORKS[network][0])
+
+        # Date range of the graphs, the statistics always cover the whole history
+        start, end = self.date_range
+        start, end = st.sidebar.slider("Date range", min_value=start.date(), max_value=end.date(), value=(start.date(), end.date()))
+        self.date_range = (pd.Timestamp(start), pd.Timestamp(end))
+
+    @timed()
+    def gas_fee_section(self):
+        data, summary = load_gas_data(self.network, self.resolution)
+        update_date = UPDATE_DATE
+
+        st.header("Graphical Comparison")
+
+        st.subheader(f"Gas Price ({NETWORKS[self.network][0]})")
+        st.write(f"""
+        The average gas price (in Gwei) graph illustrates the fluctuation in gas prices over time, 
+        providing insights into the cost of Ethereum network transactions. This visual representation helps users analyze trends 
+        and make informed decisions based on historical gas price data. 
+        The data is resampled on a {ROLLUP_LEVELS[self.resolution][0].lower()} basis to reduce noise and make the graph more readable.""")
+            
+        # Select the gas price metric
+        selected_metric = st.selectbox("Select Gas Price Metric", GAS_PRICE_METRICS)
+
+        # Calculate average gas price before and after the update
+        avg_gas_price_before_update = summary.at[selected_metric, 'mean_before']
+        avg_gas_price_after_update = summary.at[selected_metric, 'mean_after']
+
+        # Determine the color for the average gas price text based on the price change
+        avg_gas_price_color = "red" if avg_gas_price_after_update > avg_gas_price_before_update else "green"
+
+        # Determine the arrow symbol based on the price change
+        arrow_symbol = "↑" if avg_gas_price_after_update > avg_gas_price_before_update else "↓"
+
+        # Calculate Volatility of selected metric before and after the update
+        volatility_before_update = summary.at[selected_metric, 'std_before']
+        volatility_after_update = summary.at[selected_metric, 'std_after']
+
+        # Determine the color for the volatility text based on the price change
+        volatility_color = "red" if volatility_after_update > volatility_before_update else "green"
+
+        # Determine the arrow symbol for volatility based on the price change
+        volatility_arrow_symbol = "↑" if volatility_after_update > volatility_before_update else "↓"
+
+        # Display average gas price before and after the update
+        col1, col2 = st.columns(2)
+        with col1:
+            st.subheader(f"Average Gas Metric Before Update")
+            st.markdown(f"<h2>{avg_gas_price_before_update:.2f} Gwei</h2>", unsafe_allow_html=True)
+            st.subheader(f"Volatility Before Update")
+            st.markdown(f"<h2>{volatility_before_update:.2f}%</h2>", unsafe_allow_html=True)
+        with col2:
+            st.subheader("Average Gas Metric After Update")
+            st.markdown(f"<h2 style='color:{avg_gas_price_color}'>{avg_gas_price_after_update:.2f} Gwei {arrow_symbol}</h2>", unsafe_allow_html=True)
+            st.subheader("Volatility After Update")
+            st.markdown(f"<h2 style='color:{volatility_color}'>{volatility_after_update:.2f}% {volatility_arrow_symbol}</h2>", unsafe_allow_html=True)
+
+        # Create the graph, it is only built for a metric, resolution and date range not drawn before
+        def build():
+            fig = go.Figure()
+
+            # Add a trace for the selected metric
+            self.add_line(fig, data, selected_metric, mode='lines', name=selected_metric, fill='tozeroy',
+                                    fillcolor='rgba(173, 216, 230, 0.2)')  # Choose an RGBA color for the gradient
+
+            # Add a vertical line for the update date
+            fig.add_shape(type='line', x0=update_date, x1=update_date, y0=0, y1=data[selected_metric].max(),
+                        line=dict(color='orange', dash='dash'), name='Update Date')
+
+            # Configure the layout
+            fig.update_layout(title='Gas Price Analysis', xaxis_title='Date', yaxis_title='Gas Price (Gwei)',
+                            legend=dict(yanchor="top", y=0.99, xanchor="left", x=0.01))
+            return fig
+
+        # Show the graph
+        version = _rollup_version(self.resolution) if self.network == 'eth' else _panel_version()
+        self.show_cached_figure('gas_fee', (self.network, selected_metric), version, build)
+
+        self.rolling_volatility_section()
+
+        if len(self.networks) > 1:
+            self.network_comparison_section()
+
+    @timed()
+    def rolling_volatility_section(self):
+        data = load_rolling(self.network)
+        if data is None:
+            return
+
+        st.subheader("Rolling Volatility")
+        st.write("""
+        The standard deviation of the daily average gas price over the last 30 days and its exponentially weighted counterpart. 
+        The statistics are updated incrementally by the ETL, each run only processes the new days. Markers show changepoints, 
+        days where the gas price moved persistently away from its recent average.""")
+
+        def build():
+            fig = go.Figure()
+            self.add_line(fig, data, 'std', resolution='D', mode='lines', name='30 day std')
+            self.add_line(fig, data, 'ewm_std', resolution='D', mode='lines', name='EWM std (span 30)')
+
+            # Changepoints flagged by the CUSUM
+            changepoints = self.select_dates(data, 'D')
+            changepoints = changepoints[changepoints['changepoint']]
+            fig.add_trace(go.Scatter(x=changepoints.index, y=changepoints['std'], mode='markers', name='Changepoint',
+                                     marker=dict(color='orange', size=8)))
+
+            fig.add_vline(x=UPDATE_DATE, line=dict(color='orange', dash='dash'))
+            fig.update_layout(title='Rolling Gas Price Volatility', xaxis_title='Date', yaxis_title='Standard Deviation (Gwei)',
+                              legend=dict(yanchor="top", y=0.99, xanchor="left", x=0.01))
+            return fig
+
+        # The rolling statistics are daily whatever the resolution
+        self.show_cached_figure('rolling_volatility', (self.network,), _rolling_version(self.network), build)
+
+    @timed()
+    def network_comparison_section(self):
+        panel = load_panel(('average_gas_price',), self.resolution)
+
+        st.subheader("Network Comparison")
+        st.write("The average gas price of every network before and after the update, all networks compared at once.")
+
+        # Statistics of every network in one grouped pass
+        comparison = panel_summary(panel, UPDATE_DATE).rename(index=lambda network: NETWORKS[network][0])
+        st.dataframe(comparison.style.format('{:.2f}'))
+
+        # One line per network
+        def build():
+            fig = go.Figure()
+            for network in self.networks:
+                self.add_line(fig, panel.xs(network, level='network'), 'average_gas_price', mode='lines', name=NETWORKS[network][0])
+
+            fig.add_vline(x=UPDATE_DATE, line=dict(color='orange', dash='dash'))
+            fig.update_layout(title='Average Gas Price per Network', xaxis_title='Date', yaxis_title='Gas Price (Gwei)',
+                              legend=dict(yanchor="top", y=0.99, xanchor="left", x=0.01))
+            return fig
+
+        self.show_cached_figure('network_comparison', tuple(self.networks), _panel_version(), build)
+
+    @timed()
+    def volume_section(self):
+        data, update_date = load_data(('EthVolume',), self.resolution)
+        
+        st.subheader("Trading Volume")
+        st.write("""
+        The Ethereum Trading Volume analysis provides insights into the total number of contracts or shares traded over time. 
+        Trading volume is a critical metric for traders and investors as it reflects market activity and liquidity. Higher trading 
+        volumes often indicate a more active market, which can result in narrower spreads and better transaction execution. 
+        It also provides a sense of the market's strength and intensity, where sudden increases in trading volume could mean a price trend is gaining momentum, 
+        while decreases could signify a trend reversal. By examining the trend of Ethereum's trading volume, users can gain a deeper understanding of the market dynamics, 
+        which can aid in making more informed trading decisions.
+        """)
+
+        # Calculate average trading volume before and after the update
+        summary = load_summary(('EthVolume',), self.resolution)
+        avg_trading_volume_before_update = summary.at['EthVolume', 'mean_before']
+        avg_trading_volume_after_update = summary.at['EthVolume', 'mean_after']
+
+        # Determine the color for the average trading volume text based on the volume change
+        avg_trading_volume_color = "green" if avg_trading_volume_after_update > avg_trading_volume_before_update else "red"
+
+        # Determine the arrow symbol based on the volume change
+        arrow_symbol = "↑" if avg_trading_volume_after_update > avg_trading_volume_before_update else "↓"
+
+        # Display average trading volume before and after the update
+        col1, col2 = st.columns(2)
+        with col1:
+            st.subheader("Average Trading Volume Before Update")
+            st.markdown(f"<h2>{avg_trading_volume_before_update:.2f}</h2>", unsafe_allow_html=True)
+        with col2:
+            st.subheader("Average Trading Volume After Update")
+            st.markdown(f"<h2 style='color:{avg_trading_volume_color}'>{avg_trading_volume_after_update:.2f} {arrow_symbol}</h2>", unsafe_allow_html=True)
+
+        # Create the graph for trading volume, only built for a resolution and date range not drawn before
+        def build():
+            fig = go.Figure()
+
+            # Add a trace for the trading volume
+            self.add_line(fig, data, 'EthVolume', mode='lines', name='Trading Volume', fill='tozeroy',
+                                    fillcolor='rgba(173, 216, 230, 0.2)')  # Choose an RGBA color for the gradient
+
+            # Add a vertical line for the update date
+            fig.add_shape(type='line', x0=update_date, x1=update_date, y0=0, y1=data['EthVolume'].max(),
+                        line=dict(color='orange', dash='dash'), name='Update Date')
+
+            # Configure the layout
+            fig.update_layout(title='Ethereum Trading Volume Analysis', xaxis_title='Date', yaxis_title='Trading Volume',
+                            legend=dict(yanchor="top", y=0.99, xanchor="left", x=0.01))
+            return fig
+
+        # Show the graph
+        self.show_cached_figure('volume', (), _rollup_version(self.resolution), build)
+
+    @timed()
+    def tx_user_section(self):
+        data, update_date = load_data(('TransactionsAmount', *USER_METRICS), self.resolution)
+        version = _rollup_version(self.resolution)
+
+        st.subheader("Transaction and User Analysis")
+        st.write("""
+        The Transaction and User Analysis section provides insights into the number of transactions and unique users over time. 
+        Monitoring these metrics can help in understanding the Ethereum network's activity and growth. The transaction count reflects the number of Ethereum 
+        transactions conducted within a specific period, indicating the network's utilization and adoption. The growth of unique users, 
+        represented by the total count of unique addresses, signifies the expansion of the Ethereum user base. Analyzing these trends can provide valuable 
+        information about the network's popularity, user engagement, and potential market opportunities. By examining transaction volume and unique address growth, 
+        users can gain insights into the Ethereum ecosystem's dynamics and make informed decisions.
+        """)
+
+        # Calculate average transactions and user growth before and after the update
+        summary = load_summary(('TransactionsAmount', *USER_METRICS), self.resolution)
+        avg_transactions_before_update = summary.at['TransactionsAmount', 'mean_before']
+        avg_transactions_after_update = summary.at['TransactionsAmount', 'mean_after']
+
+        unique_addresses_growth_before_update = summary.at['UniqueAddressTotalCount', 'growth_before']
+        unique_addresses_growth_after_update = summary.at['UniqueAddressTotalCount', 'growth_after']
+
+        # Determine the color for the metrics text based on the change
+        avg_transactions_color = "green" if avg_transactions_after_update > avg_transactions_before_update else "red"
+        unique_addresses_growth_color = "green" if unique_addresses_growth_after_update > unique_addresses_growth_before_update else "red"
+
+        # Determine the arrow symbol based on the change
+        arrow_symbol_trans = "↑" if avg_transactions_after_update > avg_transactions_before_update else "↓"
+        arrow_symbol_addr = "↑" if unique_addresses_growth_after_update > unique_addresses_growth_before_update else "↓"
+
+        # Display average transactions 
+        col1, col2 = st.columns(2)
+        with col1:
+            st.subheader("Average Transactions Amount Before Update")
+            st.markdown(f"<h2>{avg_transactions_before_update:.2f}</h2>", unsafe_allow_html=True)
+        with col2:
+            st.subheader("Average Transactions Amount After Update")
+            st.markdown(f"<h2 style='color:{avg_transactions_color}'>{avg_transactions_after_update:.2f} {arrow_symbol_trans}</h2>", unsafe_allow_html=True)
+
+        # Create the graph for transactions analysis
+        def build_transactions():
+            fig1 = go.Figure()
+
+            # Add a trace for the transaction amounts
+            self.add_line(fig1, data, 'TransactionsAmount', mode='lines', name='Transactions Amount', fill='tozeroy',
+                                    fillcolor='rgba(173, 216, 230, 0.2)')  # Choose an RGBA color for the gradient
+
+            # Add a vertical line for the update date
+            fig1.add_shape(type='line', x0=update_date, x1=update_date, y0=0, y1=data['TransactionsAmount'].max() * 1.5,
+                        line=dict(color='orange', dash='dash'), name='Update Date')
+
+            fig1.update_layout(title='Transaction Analysis', xaxis_title='Date', yaxis_title='Transactions Amount',
+                    legend=dict(yanchor="top", y=0.99, xanchor="left", x=0.01))
+
+            # Set custom y-axis range for the Transactions Amount graph
+            fig1.update_yaxes(range=[0, data['TransactionsAmount'].max() * 1.5])
+            return fig1
+
+        # Show the graph
+        self.show_cached_figure('transactions', (), version, build_transactions)
+
+        # Display unique addresses growth
+        col1, col2 = st.columns(2)
+
+        with col1:
+            st.subheader("Unique Addresses Growth Before Update")
+            st.markdown(f"<h2>{unique_addresses_growth_before_update:.2f}%</h2>", unsafe_allow_html=True)
+        with col2:
+            st.subheader("Unique Addresses Growth After Update")
+            st.markdown(f"<h2 style='color:{unique_addresses_growth_color}'>{unique_addresses_growth_after_update:.2f}% {arrow_symbol_addr}</h2>", unsafe_allow_html=True)
+
+        # Define the color gradients for each line
+        colors = ['rgba(173, 216, 230, 0.2)', 'rgba(144, 238, 144, 0.2)', 'rgba(255, 192, 203, 0.2)']
+
+        # Select the lines to display
+        selected_lines = st.multiselect("Select User Analysis Lines", USER_METRICS,
+                                        default=['UniqueAddressTotalCount'])
+
+        # Create the graph for user analysis, only built for a selection of lines not drawn before
+        def build_users():
+            fig2 = go.Figure()
+
+            # Add the selected traces to the graph
+            for line in selected_lines:
+                self.add_line(fig2, data, line, mode='lines', name=line, fill='tozeroy',
+                                        fillcolor=colors[selected_lines.index(line)])
+
+            # Add a vertical line for the update date
+            fig2.add_shape(type='line', x0=update_date, x1=update_date, y0=0, y1=data['UniqueAddressTotalCount'].max(),
+                        line=dict(color='orange', dash='dash'), name='Update Date')
+
+            # Configure the layout
+            fig2.update_layout(title='User Analysis', xaxis_title='Date', yaxis_title='Unique Addresses Count',
+                            legend=dict(yanchor="top", y=0.99, xanchor="left", x=0.01))
+            return fig2
+
+        # Show the graph
+        self.show_cached_figure('users', tuple(selected_lines), version, build_users)
+
+    @timed()
+    def eth_burnt_section(self):
+        data, update_date = load_data(('DailyEthBurnt',), self.resolution)
+        
+        st.subheader("Daily ETH Burned Analysis")
+        st.write("""
+        The Daily ETH Burned analysis provides insights into the amount of Ethereum (ETH) burned on a daily basis. ETH burning refers to the process of permanently removing ETH from circulation, typically through token burning mechanisms, smart contracts, or network fees. ETH burning became more prevalent with the implementation of the London upgrade. Monitoring the daily ETH burned metric can offer valuable information about the overall deflationary supply dynamics of Ethereum and the network's economic activity. By analyzing the average ETH burned, users can gain insights into the network's deflationary mechanisms and the impact on supply and demand dynamics.
+        """)
+
+        # Filter data for the "after" period
+        data_after_update = data.iloc[data.index.searchsorted(update_date):]
+
+        # Calculate average ETH burned
+        avg_eth_burned = load_summary(('DailyEthBurnt',), self.resolution).at['DailyEthBurnt', 'mean_after']
+
+        # Display average ETH burned
+        st.subheader("Average ETH Burned")
+        st.markdown(f"<h2>{avg_eth_burned:.2f} ETH</h2>", unsafe_allow_html=True)
+
+        # Create the graph for Daily ETH Burned (after period)
+        def build():
+            fig3 = go.Figure()
+
+            # Add a trace for the Daily ETH Burned
+            self.add_line(fig3, data_after_update, 'DailyEthBurnt', mode='lines', name='Daily ETH Burned', fill='tozeroy',
+                                    fillcolor='rgba(173, 216, 230, 0.2)')  # Light blue color for the gradient
+
+            # Configure the layout
+            fig3.update_layout(title='Daily ETH Burned Analysis', xaxis_title='Date', yaxis_title='ETH Burned',
+                            legend=dict(yanchor="top", y=0.99, xanchor="left", x=0.01))
+            return fig3
+
+        # Show the graph
+        self.show_cached_figure('eth_burnt', (), _rollup_version(self.resolution), build)
+
+    @timed()
+    def block_size_section(self):
+        data, update_date = load_data(('BlockSize',), self.resolution)
+
+        st.subheader("Block Size Analysis")
+        st.write("""
+        The Block Size analysis provides insights into the size of Ethereum blocks. Block size refers to the amount of data that can be included in a single block on the Ethereum blockchain. Monitoring the block size can offer valuable information about the network's capacity, efficiency, and scalability. By analyzing the average block size before and after a specific update, users can gain insights into changes in the network's capacity to process transactions and handle data. Understanding block size trends can be useful for evaluating the performance and scalability of the Ethereum network.
+        """)
+
+        # Calculate average block size before and after the update
+        summary = load_summary(('BlockSize',), self.resolution)
+        avg_block_size_before_update = summary.at['BlockSize', 'mean_before']
+        avg_block_size_after_update = summary.at['BlockSize', 'mean_after']
+
+        # Determine the color for the average block size text based on the change
+        avg_block_size_color = "green" if avg_block_size_after_update > avg_block_size_before_update else "red"
+
+        # Determine the arrow symbol based on the change
+        arrow_symbol = "↑" if avg_block_size_after_update > avg_block_size_before_update else "↓"
+
+        # Display average block size before and after the update
+        col1, col2 = st.columns(2)
+        with col1:
+            st.subheader("Average Block Size Before Update")
+            st.markdown(f"<h2>{avg_block_size_before_update:.2f}</h2>", unsafe_allow_html=True)
+        with col2:
+            st.subheader("Average Block Size After Update")
+            st.markdown(f"<h2 style='color:{avg_block_size_color}'>{avg_block_size_after_update:.2f} {arrow_symbol}</h2>", unsafe_allow_html=True)
+
+        # Create the graph for Block Size
+        def build():
+            fig4 = go.Figure()
+
+            # Add a vertical line for the update date
+            fig4.add_shape(type='line', x0=update_date, x1=update_date, y0=0, y1=data['BlockSize'].max(),
+                        line=dict(color='orange', dash='dash'), name='Update Date')
+
+            # Add a trace for the Block Size
+            self.add_line(fig4, data, 'BlockSize', mode='lines', name='Block Size', fill='tozeroy',
+                                    fillcolor='rgba(173, 216, 230, 0.2)')  # Purple color for the gradient
+
+            # Configure the layout
+            fig4.update_layout(title='Block Size Analysis', xaxis_title='Date', yaxis_title='Block Size',
+                            legend=dict(yanchor="top", y=0.99, xanchor="left", x=0.01))
+            return fig4
+
+        # Show the graph
+        self.show_cached_figure('block_size', (), _rollup_version(self.resolution), build)
+
+    @timed()
+    def eth_price_section(self):
+        data, update_date = load_data(ETH_PRICE_METRICS, self.resolution)
+
+        st.subheader("Ethereum Price Analysis")
+        st.write("""
+        The Ethereum Price Analysis section provides insights into the price movement of Ethereum (ETH) over time. Monitoring the price of ETH is crucial for understanding market trends, volatility, and potential investment opportunities. By analyzing the average ETH price and price fluctuations, users can gain insights into the overall performance and market sentiment surrounding Ethereum. This analysis can help inform decisions related to trading, investing, and market entry or exit points.
+        """)
+
+        # Select the Ethereum price column to display on the graph
+        selected_column = st.selectbox("Select Ethereum Price Metric", ETH_PRICE_METRICS)
+
+        # Calculate average ETH price before and after the update
+        summary = load_summary(ETH_PRICE_METRICS, self.resolution)
+        avg_eth_price_before_update = summary.at[selected_column, 'mean_before']
+        avg_eth_price_after_update = summary.at[selected_column, 'mean_after']
+
+        # Determine the color for the average ETH price text based on the price change
+        avg_eth_price_color = "green" if avg_eth_price_after_update > avg_eth_price_before_update else "red"
+
+        # Determine the arrow symbol based on the price change
+        arrow_symbol = "↑" if avg_eth_price_after_update > avg_eth_price_before_update else "↓"
+
+        # Display average ETH price before and after the update
+        col1, col2 = st.columns(2)
+        with col1:
+            st.subheader("Average ETH Price Before Update")
+            st.markdown(f"<h2>${avg_eth_price_before_update:.2f}</h2>", unsafe_allow_html=True)
+        with col2:
+            st.subheader("Average ETH Price After Update")
+            st.markdown(f"<h2 style='color:{avg_eth_price_color}'>${avg_eth_price_after_update:.2f} {arrow_symbol}</h2>", unsafe_allow_html=True)
+
+        # Create the graph for Ethereum Price, only built for a metric, resolution and date range not drawn before
+        def build():
+            fig5 = go.Figure()
+
+            # Add a vertical line for the update date
+            fig5.add_shape(type='line', x0=update_date, x1=update_date, y0=0, y1=data[selected_column].max(),
+                        line=dict(color='orange', dash='dash'), name='Update Date')
+
+            # Add a trace for the selected Ethereum price column
+            self.add_line(fig5, data, selected_column, mode='lines', name=selected_column, fill='tonexty',
+                                    fillcolor='rgba(173, 216, 230, 0.2)')  # Steel blue color for the gradient
+
+            # Configure the layout
+            fig5.update_layout(title='Ethereum Price Analysis', xaxis_title='Date', yaxis_title='ETH Price (USD)',
+                            legend=dict(yanchor="top", y=0.99, xanchor="left", x=0.01))
+            return fig5
+
+        # Show the graph
+        self.show_cached_figure('eth_price', (selected_column,), _rollup_version(self.resolution), build)
+
+    def render(self):
+        self.gas_fee_section()
+        self.eth_price_section()
+        self.volume_section()
+        self.tx_user_section()
+        self.eth_burnt_section()
+        self.block_size_section()
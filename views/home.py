@@ -0,0 +1,71 @@
+import streamlit as st
+from ticker import LiveTicker
+from views.common import get_recorder, timed
+
+
+@st.cache_resource
+def get_live_ticker():
+    """Returns the live price ticker shared by every session, polling in the background"""
+    return LiveTicker().start()
+
+
+class HomePage:
+
+    def sidebar(self):
+        """The homepage has no controls of its own"""
+
+    def format_live_value(self, quote):
+        if quote['value'] is None:
+            return "unavailable"
+        age = f"{quote['age']:.0f}s ago" if quote['age'] < 120 else f"{quote['age'] / 60:.0f} min ago"
+        if quote['stale']:
+            return f"{quote['value']} <span style='color:orange'>(stale, updated {age})</span>"
+        return f"{quote['value']} <span style='color:gray'>(updated {age})</span>"
+
+    @timed()
+    def display_homepage(self):
+        st.header("Homepage")
+
+        # Served from the shared ticker, only a cold start waits briefly for the first values
+        ticker = get_live_ticker()
+        with get_recorder().stage('network'):
+            eth_price = ticker.get('eth_price', wait=2)
+            gas_price = ticker.get('gas_price', wait=2)
+
+        col1, col2 = st.columns(2)
+
+        with col1:
+            st.markdown(f"<span style='color:blue'><b>Live Ethereum Price (USD):</b></span> {self.format_live_value(eth_price)}", unsafe_allow_html=True)
+
+        with col2:
+            st.markdown(f"<span style='color:blue'><b>Live Fast Gas Price (Gwei):</b></span> {self.format_live_value(gas_price)}", unsafe_allow_html=True)
+
+
+        st.markdown("""
+        ## Introduction 
+
+        Welcome to the Ethereum Gas Fees Analysis app! This app aims to examine the state of Ethereum's gas fees before and after the London Upgrade. 
+
+        ## Why this Analysis?
+
+        The Ethereum network underwent a major upgrade in August 2021, dubbed the "London Upgrade". One of the significant changes in this upgrade was the introduction of EIP-1559, which aimed to overhaul the transaction fee market. This analysis aims to quantify the impact of the London Upgrade on transaction fees, also known as gas fees.
+
+        ## How to Use This App
+
+        On the left sidebar, you will see several options: 
+
+        - **Homepage**: Provides an overview and instructions for the app (you are here now).
+
+        - **Graphical Comparison**: Presents a detailed graphical view of the gas fees before and after the London upgrade.
+
+        - **Statistical Comparison**: Presents our chosen hypotheses and their acceptance/rejection along with explanations.
+
+        - **Event Study**: Compares every metric in windows of 7 to 90 days before and after the London, Merge, Shanghai and Dencun upgrades.
+
+        - **Cross-Correlation**: Shows which metrics lead or lag each other, and by how much, before and after the London upgrade.
+
+        Feel free to navigate between these pages to explore the analysis. Each page will offer visualizations and insights about the data.
+        """)
+
+    def render(self):
+        self.display_homepage()
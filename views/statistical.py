@@ -0,0 +1,168 @@
+import streamlit as st
+from etl import dataset_version
+from hypothesis_tests import run_tests
+from views.common import get_recorder, timed
+from views.data import load_dataset, UPDATE_DATE
+
+
+@st.cache_data(show_spinner="Running statistical tests...")
+def _load_test_results(version, resamples, confidence):
+    get_recorder().cache_miss('tests')
+    return run_tests(load_dataset(version), UPDATE_DATE, resamples=resamples, confidence=confidence)
+
+
+@timed('compute')
+def load_test_results(resamples=2000, confidence=0.95):
+    """Returns the statistical tests of every metric on the daily dataset, see run_tests"""
+    with get_recorder().cache_lookup('tests'):
+        return _load_test_results(dataset_version(), resamples, confidence)
+
+
+class StatisticalComparisonPage:
+
+    def sidebar(self):
+        """The test parameters are chosen on the page itself"""
+
+    @timed()
+    def statistical_comparison(self):
+        st.header("Statistical Comparison")
+        st.markdown("""In this analysis, we employ statistical tests to assess the significance of any observed differences. Non-parametric tests, such as the Wilcoxon test and Mann-Whitney U test, are used for comparing gas prices. Additionally, the Levene test and F oneway test are employed to examine the volatility in gas prices. Lastly, transaction volume is assessed using the Wilcoxon test.
+                    The findings from this analysis will shed light on whether the London Upgrade had a noticeable impact on gas prices, volatility, and transaction volume in the Ethereum network. Understanding these effects is crucial for assessing the overall efficiency and performance of the network following the upgrade.""")
+
+        st.markdown("""All tests are computed from the daily data currently loaded. Bootstrap confidence intervals and permutation p-values are based on the number of resamples chosen below.""")
+
+        # Test parameters, results are cached per dataset version and parameters
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            alpha = st.selectbox("Significance level", [0.05, 0.01, 0.001])
+        with col2:
+            resamples = st.select_slider("Resamples", [1000, 2000, 5000, 10000, 20000], value=2000)
+        with col3:
+            confidence = st.selectbox("Confidence level", [0.95, 0.99, 0.9])
+
+        results = load_test_results(resamples, confidence)
+
+        with st.expander("Test results for every metric"):
+            st.dataframe(results)
+
+        return results, alpha
+
+    def hypothesis_result(self, result):
+        if result.lower() == 'reject':  # if result is 'reject', we reject the null hypothesis
+            st.markdown('<p style="font-size:30px;font-weight:bold;color:red;">Rejected</p>', unsafe_allow_html=True)
+        elif result.lower() == 'accept':  # if result is 'accept', we accept the null hypothesis
+            st.markdown('<p style="font-size:30px;font-weight:bold;color:green;">Accepted</p>', unsafe_allow_html=True)
+        else:  # if result is unclear, display in blue
+            st.markdown('<p style="font-size:30px;font-weight:bold;color:blue;">Not rejected</p>', unsafe_allow_html=True)
+
+    @timed()
+    def hypothesis_one_section(self, title, result, tests):
+        st.markdown(f"## {title}")
+
+        # Hypothesis testing
+        self.hypothesis_result(result)
+
+        # Short explanation
+        st.markdown(f"""
+            ### Tests
+            Wilcoxon Test: p-value: {tests['wilcoxon_p']:.4g},
+            Mann-Whitney U Test: p-value: {tests['mannwhitney_p']:.4g},
+            Permutation Test: p-value: {tests['permutation_p']:.4g}
+
+            Difference in means (after - before): {tests['mean_diff']:.2f} Gwei, confidence interval [{tests['mean_diff_low']:.2f}, {tests['mean_diff_high']:.2f}]
+            """)
+
+        direction = "lower" if tests['mean_diff'] > 0 else "higher"
+
+        # Short explanation
+        st.markdown(f"""
+            ### Explanation
+            After conducting a normality test, it was determined that the data does not follow a normal distribution. Therefore, the use of a t-test is not recommended for comparing means. 
+                    Instead, non-parametric tests are suggested as an alternative.
+            
+            A Wilcoxon test was performed, comparing gas prices in the "before" group with the "after" group (p-value: {tests['wilcoxon_p']:.4g}). A p-value below the significance level indicates significantly {direction} gas prices in the "before" group. The Mann-Whitney U test (p-value: {tests['mannwhitney_p']:.4g}) and the permutation test on the difference in means serve as a check of this finding.
+            """)
+
+    @timed()
+    def hypothesis_two_section(self, title, result, tests):
+        st.markdown(f"## {title}")
+
+        # Hypothesis testing
+        self.hypothesis_result(result)
+
+        # Short explanation
+        st.markdown(f"""
+            ### Tests
+            Levene test: p-value: {tests['levene_p']:.4g}, F oneway test: p-value: {tests['anova_p']:.4g}
+
+            Ratio of standard deviations (after / before): {tests['std_ratio']:.2f}, confidence interval [{tests['std_ratio_low']:.2f}, {tests['std_ratio_high']:.2f}]
+            """)
+
+        direction = "higher" if tests['std_ratio'] > 1 else "lower"
+
+        # Short explanation
+        st.markdown(f"""
+            ### Explanation
+            A Levene test for equality of variances was conducted. A p-value below the significance level means the variances are not equal. The F oneway test compares the means of the two groups and is shown as a complementary check.
+
+            Furthermore, it is noteworthy that the variances are now {direction}.
+            """)
+
+    @timed()
+    def hypothesis_three_section(self, title, result, tests):
+        st.markdown(f"## {title}")
+
+        # Hypothesis testing
+        self.hypothesis_result(result)
+
+        # Short explanation
+        st.markdown(f"""
+            ### Tests
+            Wilcoxon Test: p-value: {tests['wilcoxon_p']:.4g}
+
+            Difference in means (after - before): {tests['mean_diff']:.0f} transactions, confidence interval [{tests['mean_diff_low']:.0f}, {tests['mean_diff_high']:.0f}]
+            """)
+        
+        # Short explanation
+        if result.lower() == 'reject':
+            explanation = "The low p-value obtained means we reject the null hypothesis. There is sufficient evidence to assert that the transaction amount changed significantly after the upgrade."
+        else:
+            explanation = "The high p-value obtained suggests that we cannot reject the null hypothesis. Consequently, we do not have sufficient evidence to assert that there is a significant change in the transaction amount before and after the upgrade. Thus, we cannot reject the null hypothesis, indicating that the transaction amounts remain the same."
+        st.markdown(f"""
+            ### Explanation
+            {explanation}""")
+
+    @timed()
+    def hypothesis_four_section(self, title, result, tests):
+        st.markdown(f"## {title}")
+
+        # Hypothesis testing
+        self.hypothesis_result(result)
+
+        # Short explanation
+        st.markdown(f"""
+            ### Tests
+            Levene Test: p-value: {tests['levene_p']:.4g}
+
+            Ratio of standard deviations (after / before): {tests['std_ratio']:.2f}, confidence interval [{tests['std_ratio_low']:.2f}, {tests['std_ratio_high']:.2f}]
+            """)
+
+        direction = "smaller" if tests['std_ratio'] < 1 else "larger"
+
+        # Short explanation
+        st.markdown(f"""
+            ### Explanation
+            A p-value below the significance level means the null hypothesis for variance equality is rejected, which implies that the variances are not equal. Furthermore, the variance is now {direction} than before.""")
+
+    def verdict(self, alpha, *p_values):
+        """Returns 'reject' if every p-value is below the significance level, otherwise 'unclear'"""
+        return 'reject' if all(p < alpha for p in p_values) else 'unclear'
+
+    def render(self):
+        results, alpha = self.statistical_comparison()
+        gas = results.loc['average_gas_price']
+        transactions = results.loc['TransactionsAmount']
+        self.hypothesis_one_section('Hypothesis: Average Gas Price before is equal to Average Gas Price after', self.verdict(alpha, gas['wilcoxon_p'], gas['mannwhitney_p']), gas)
+        self.hypothesis_two_section('Hypothesis: Volatility before is equal to Volatility after', self.verdict(alpha, gas['levene_p']), gas)
+        self.hypothesis_three_section('Hypothesis: The amount of transactions is equal to before the update', self.verdict(alpha, transactions['wilcoxon_p']), transactions)
+        self.hypothesis_four_section('Hypothesis: The variance of transactions is equal to before the update', self.verdict(alpha, transactions['levene_p']), transactions)